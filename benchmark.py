@@ -0,0 +1,336 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+# 渲染基准使用 SDL 的 dummy 显示驱动，不需要真实窗口
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game.block import Block, SHAPES
+from game.board import Board, column_tops
+from game.colors import GRAY
+from game.core import GameCore, Action
+from game.pieces import PieceGenerator
+
+# 用于构造测试局面的杂乱行：每行随机填充，但至少留一个空位，不会被消除
+GARBAGE_ROWS = 8
+# 超大游戏板基准的大小，耗时应与普通大小的游戏板处于同一量级
+HUGE_WIDTH = 1000
+HUGE_HEIGHT = 100000
+
+def _garbage_board(rng, width=10, height=20, full_rows=0):
+    """底部 full_rows 行填满，其上 GARBAGE_ROWS 行随机填充的游戏板"""
+    board = Board(width, height)
+    for i in range(GARBAGE_ROWS + full_rows):
+        y = height - 1 - i
+        if i < full_rows:
+            filled = range(width)
+        else:
+            hole = rng.randrange(width)
+            filled = [x for x in range(width) if x != hole and rng.random() < 0.7]
+        row = list(board.board[y])
+        for x in filled:
+            row[x] = GRAY
+            board.rows[y] |= 1 << x
+        board.board[y] = tuple(row)
+    board.tops = column_tops(board.rows, width)
+    return board
+
+def _random_block(rng, board):
+    """随机形状、旋转和横向位置，并落到最低的有效位置"""
+    block = Block(rng.randrange(len(SHAPES)))
+    for _ in range(rng.randrange(4)):
+        block.rotate()
+    left, _, right, _ = block.state.bbox
+    block.x = rng.randint(-left, board.width - 1 - right)
+    block.y = 0
+    while True:
+        block.y += 1
+        if not board.is_valid_move(block):
+            block.y -= 1
+            return block
+
+def bench_is_valid_move(rng, number):
+    board = _garbage_board(rng)
+    blocks = []
+    for _ in range(256):
+        block = _random_block(rng, board)
+        # 一半是落点（有效），一半再下移一格（通常与已有方块重叠）
+        block.y += rng.randrange(2)
+        blocks.append(block)
+    is_valid_move = board.is_valid_move
+    start = time.perf_counter()
+    for i in range(number):
+        is_valid_move(blocks[i & 255])
+    return time.perf_counter() - start, number
+
+def bench_drop_y(rng, number):
+    board = _garbage_board(rng)
+    blocks = []
+    for _ in range(256):
+        block = Block(rng.randrange(len(SHAPES)))
+        for _ in range(rng.randrange(4)):
+            block.rotate()
+        left, _, right, _ = block.state.bbox
+        block.x = rng.randint(-left, board.width - 1 - right)
+        blocks.append(block)
+    drop_y = board.drop_y
+    start = time.perf_counter()
+    for i in range(number):
+        drop_y(blocks[i & 255])
+    return time.perf_counter() - start, number
+
+def bench_lock_block(rng, number):
+    boards = [_garbage_board(rng) for _ in range(number)]
+    blocks = [_random_block(rng, board) for board in boards]
+    start = time.perf_counter()
+    for board, block in zip(boards, blocks):
+        board.lock_block(block)
+    return time.perf_counter() - start, number
+
+def _bench_clear_lines(lines):
+    def bench(rng, number):
+        boards = [_garbage_board(rng, full_rows=lines) for _ in range(number)]
+        start = time.perf_counter()
+        for board in boards:
+            board.clear_lines()
+        return time.perf_counter() - start, number
+    return bench
+
+def bench_clear_lines_tall(rng, number):
+    """HUGE_HEIGHT 行高的游戏板上消除 4 行，每次消除前恢复底部的局面，只计消行的耗时"""
+    board = _garbage_board(rng, height=HUGE_HEIGHT, full_rows=4)
+    band = GARBAGE_ROWS + 4
+    saved = board.board[-band:], board.rows[-band:], list(board.tops)
+    elapsed = 0
+    for _ in range(number):
+        board.board[-band:], board.rows[-band:], board.tops = saved[0], saved[1], list(saved[2])
+        start = time.perf_counter()
+        board.clear_lines()
+        elapsed += time.perf_counter() - start
+    return elapsed, number
+
+def bench_rotate(rng, number):
+    block = Block(rng.randrange(len(SHAPES)))
+    rotate = block.rotate
+    start = time.perf_counter()
+    for _ in range(number):
+        rotate()
+    return time.perf_counter() - start, number
+
+def bench_rotate_back(rng, number):
+    block = Block(rng.randrange(len(SHAPES)))
+    rotate_back = block.rotate_back
+    start = time.perf_counter()
+    for _ in range(number):
+        rotate_back()
+    return time.perf_counter() - start, number
+
+def bench_get_positions(rng, number):
+    blocks = [Block(i % len(SHAPES)) for i in range(len(SHAPES))]
+    for block in blocks:
+        for _ in range(rng.randrange(4)):
+            block.rotate()
+    start = time.perf_counter()
+    for i in range(number):
+        blocks[i % 7].get_positions()
+    return time.perf_counter() - start, number
+
+def _random_piece(core, rng):
+    """随机旋转、平移后硬降落当前方块"""
+    for _ in range(rng.randrange(4)):
+        core.apply(Action.ROTATE)
+    shift = Action.LEFT if rng.random() < 0.5 else Action.RIGHT
+    for _ in range(rng.randrange(6)):
+        core.apply(shift)
+    core.apply(Action.HARD_DROP)
+
+def _played_core(rng, pieces=40):
+    """随机放置若干方块后的一局游戏，用于渲染基准"""
+    core = GameCore(generator=PieceGenerator(rng.randrange(2 ** 32)))
+    while core.pieces < pieces and not core.game_over:
+        _random_piece(core, rng)
+    if core.game_over:
+        core.reset()
+    return core
+
+def bench_render_game(rng, number):
+    import tetris
+    screen = tetris.init_display()
+    font = tetris.get_font(36)
+    renderer = tetris.BoardRenderer(screen, font, (tetris.BOARD_OFFSET_X, tetris.BOARD_OFFSET_Y),
+                                    tetris.BLOCK_SIZE, preview_pos=(tetris.SCREEN_WIDTH - 120, 120),
+                                    next_label=tetris.NEXT_BLOCK_TEXT,
+                                    next_label_pos=(tetris.SCREEN_WIDTH - 150, 80),
+                                    score_label=tetris.SCORE_TEXT, score_pos=(20, 20))
+    pause_button = tetris.create_game_buttons(tetris.SCREEN_WIDTH // 2 - tetris.BUTTON_WIDTH // 2)[0]
+    core = _played_core(rng)
+    start = time.perf_counter()
+    for _ in range(number):
+        # 每帧整屏重绘
+        renderer.invalidate()
+        renderer.draw(core.board, core.current_block, core.next_block)
+        pause_button.draw(screen)
+        pygame.display.flip()
+    return time.perf_counter() - start, number
+
+def bench_render_menu(rng, number):
+    import tetris
+    screen = tetris.init_display()
+    center_x = tetris.SCREEN_WIDTH // 2 - tetris.BUTTON_WIDTH // 2
+    buttons = [tetris.Button(center_x, tetris.MENU_BUTTON_START_Y + i * tetris.MENU_BUTTON_GAP,
+                             tetris.BUTTON_WIDTH, tetris.BUTTON_HEIGHT, text,
+                             tetris.BUTTON_COLOR, tetris.BUTTON_HOVER_COLOR)
+               for i, text in enumerate(["新游戏", "继续游戏", tetris.QUIT_BUTTON_TEXT])]
+    start = time.perf_counter()
+    for _ in range(number):
+        tetris.draw_menu(screen, buttons)
+        pygame.display.flip()
+    return time.perf_counter() - start, number
+
+def bench_headless_engine(rng, number):
+    """不含 AI 的引擎吞吐量：随机放置 number 个方块"""
+    core = GameCore(generator=PieceGenerator(rng.randrange(2 ** 32)))
+    placed = 0
+    start = time.perf_counter()
+    while placed < number:
+        _random_piece(core, rng)
+        placed += 1
+        if core.game_over:
+            core.reset()
+    return time.perf_counter() - start, placed
+
+def bench_headless_engine_huge(rng, number):
+    """HUGE_WIDTH × HUGE_HEIGHT 的游戏板上随机放置 number 个方块"""
+    core = GameCore(HUGE_WIDTH, HUGE_HEIGHT, PieceGenerator(rng.randrange(2 ** 32)))
+    placed = 0
+    start = time.perf_counter()
+    while placed < number:
+        _random_piece(core, rng)
+        placed += 1
+        if core.game_over:
+            core.reset()
+    return time.perf_counter() - start, placed
+
+def bench_headless_selfplay(rng, number):
+    """端到端吞吐量：AI 按 60 帧每秒的节奏玩一局，直到放置 number 个方块"""
+    from selfplay import play_game
+    placed = 0
+    start = time.perf_counter()
+    while placed < number:
+        result = play_game(0, rng.randrange(2 ** 32), max_pieces=number - placed)
+        placed += result['pieces']
+    return time.perf_counter() - start, placed
+
+def bench_env_steps(rng, number):
+    """训练环境吞吐量：64 个环境的 VecEnv 执行随机动作，按单个环境的步数计"""
+    from game.env import VecEnv, ACTION_COUNT
+    n = 64
+    env = VecEnv(n, seed=rng.randrange(2 ** 32))
+    env.reset()
+    # 至少执行一批，--scale 很小时也能得到结果
+    actions = [[rng.randrange(ACTION_COUNT) for _ in range(n)] for _ in range(max(1, number // n))]
+    start = time.perf_counter()
+    for batch in actions:
+        env.step(batch)
+    return time.perf_counter() - start, len(actions) * n
+
+# (名称, 函数, 每轮操作数)
+BENCHMARKS = [
+    ('board.is_valid_move', bench_is_valid_move, 100000),
+    ('board.drop_y', bench_drop_y, 100000),
+    ('board.lock_block', bench_lock_block, 5000),
+    ('board.clear_lines[1]', _bench_clear_lines(1), 5000),
+    ('board.clear_lines[2]', _bench_clear_lines(2), 5000),
+    ('board.clear_lines[3]', _bench_clear_lines(3), 5000),
+    ('board.clear_lines[4]', _bench_clear_lines(4), 5000),
+    ('board.clear_lines[tall]', bench_clear_lines_tall, 5000),
+    ('block.rotate', bench_rotate, 100000),
+    ('block.rotate_back', bench_rotate_back, 100000),
+    ('block.get_positions', bench_get_positions, 100000),
+    ('render.game_frame', bench_render_game, 200),
+    ('render.menu_frame', bench_render_menu, 200),
+    ('headless.engine_pieces', bench_headless_engine, 2000),
+    ('headless.engine_pieces[huge]', bench_headless_engine_huge, 2000),
+    ('headless.selfplay_pieces', bench_headless_selfplay, 200),
+    ('headless.env_steps', bench_env_steps, 6400),
+]
+
+def run_benchmark(func, number, repeat, seed):
+    """运行 repeat 轮，每轮使用相同种子生成相同的输入，返回每次操作耗时的统计"""
+    per_op = []
+    for _ in range(repeat):
+        elapsed, ops = func(random.Random(seed), number)
+        per_op.append(elapsed / ops * 1e9)
+    median = statistics.median(per_op)
+    return {
+        'number': number,
+        'repeat': repeat,
+        'min_ns': round(min(per_op), 1),
+        'median_ns': round(median, 1),
+        'mean_ns': round(statistics.mean(per_op), 1),
+        'ops_per_second': round(1e9 / median, 1),
+    }
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(results, baseline):
+    """与之前保存的结果对比，输出中位数耗时之比（小于 1 表示变快）"""
+    for name, result in results.items():
+        old = baseline.get('results', {}).get(name)
+        if old is None:
+            print(f"{name:<28}{result['median_ns']:>14.1f} ns   (无基线)")
+            continue
+        ratio = result['median_ns'] / old['median_ns'] if old['median_ns'] else float('inf')
+        print(f"{name:<28}{old['median_ns']:>14.1f} -> {result['median_ns']:>12.1f} ns   x{ratio:.3f}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='游戏板、方块、渲染和无界面吞吐量的基准测试')
+    parser.add_argument('--seed', type=int, default=0, help='生成测试输入的随机种子')
+    parser.add_argument('--repeat', type=int, default=5, help='每项基准运行的轮数')
+    parser.add_argument('--scale', type=float, default=1.0, help='每轮操作数的缩放系数')
+    parser.add_argument('-k', '--filter', default=None, help='只运行名称包含该字符串的基准')
+    parser.add_argument('-o', '--output', default=None, help='结果写入的 JSON 文件')
+    parser.add_argument('--compare', default=None, help='与之前保存的 JSON 结果对比')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = {}
+    for name, func, number in BENCHMARKS:
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = run_benchmark(func, max(1, int(number * args.scale)), args.repeat, args.seed)
+        result = results[name]
+        print(f"{name:<28}{result['median_ns']:>14.1f} ns/op  {result['ops_per_second']:>14.1f} op/s")
+
+    report = {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"结果已写入: {args.output}")
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            compare(results, json.load(f))
+    pygame.quit()
+    return report
+
+if __name__ == '__main__':
+    main()
@@ -29,6 +29,22 @@ def build_app():
         '--hidden-import=game.board',
         '--hidden-import=game.button',
         '--hidden-import=game.ui_constants',
+        '--hidden-import=game.core',
+        '--hidden-import=game.ai',
+        '--hidden-import=game.pieces',
+        '--hidden-import=game.replay',
+        '--hidden-import=game.renderer',
+        '--hidden-import=game.surface_cache',
+        '--hidden-import=game.fonts',
+        '--hidden-import=game.startup',
+        '--hidden-import=game.scheduler',
+        '--hidden-import=game.profiler',
+        '--hidden-import=game.snapshot',
+        '--hidden-import=game.history',
+        '--hidden-import=game.session',
+        '--hidden-import=game.ui',
+        '--hidden-import=game.input',
+        '--hidden-import=game.stats',
         '--collect-all=pygame',  # 收集所有pygame相关文件
         '--clean',  # 清理临时文件
     ]
@@ -49,6 +65,22 @@ def build_app():
             'game/board.py',
             'game/button.py',
             'game/ui_constants.py',
+            'game/core.py',
+            'game/ai.py',
+            'game/pieces.py',
+            'game/replay.py',
+            'game/renderer.py',
+            'game/surface_cache.py',
+            'game/fonts.py',
+            'game/startup.py',
+            'game/scheduler.py',
+            'game/profiler.py',
+            'game/snapshot.py',
+            'game/history.py',
+            'game/session.py',
+            'game/ui.py',
+            'game/input.py',
+            'game/stats.py',
         ]
         
         for file in required_files:
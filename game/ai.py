@@ -0,0 +1,199 @@
+from collections import OrderedDict
+
+from .block import ROTATIONS, spawn_offsets
+from .board import column_tops, shape_fits, landing_y
+from .core import Action
+
+# 默认启发式权重：空洞、总高度、凹凸度为惩罚项，消除行数为奖励项
+DEFAULT_WEIGHTS = {
+    'holes': -0.35663,
+    'aggregate_height': -0.510066,
+    'bumpiness': -0.184483,
+    'lines': 0.760666,
+}
+
+def _popcount(value):
+    return bin(value).count('1')
+
+# Python 3.10 起可以直接用 int.bit_count
+if hasattr(int, 'bit_count'):
+    _popcount = int.bit_count
+
+class _Placer:
+    """某个旋转状态用于落点搜索的预计算数据"""
+    def __init__(self, rotation, state):
+        self.rotation = rotation
+        self.state = state
+        self.left = state.bbox[0]
+        self.row_masks = state.row_masks
+
+def _build_placers(states):
+    """去掉形状相同的旋转状态（例如 O 方块），它们的落点集合完全一样"""
+    placers = []
+    seen = set()
+    for rotation, state in enumerate(states):
+        top = state.bbox[1]
+        key = tuple((dy - top, mask) for dy, mask in state.row_masks)
+        if key not in seen:
+            seen.add(key)
+            placers.append(_Placer(rotation, state))
+    return tuple(placers)
+
+PLACERS = tuple(_build_placers(states) for states in ROTATIONS)
+
+def evaluate(rows, width, lines, weights=DEFAULT_WEIGHTS):
+    """按启发式给一个局面打分，分数越高越好"""
+    height = len(rows)
+    heights = [0] * width
+    holes = 0
+    seen = 0
+    for y, row in enumerate(rows):
+        if not seen:
+            # 跳过顶部的空行
+            if not row:
+                continue
+        else:
+            # 上方已有方块但本行为空的格子即为空洞
+            covered = seen & ~row
+            if covered:
+                holes += _popcount(covered)
+        new = row & ~seen
+        while new:
+            low = new & -new
+            heights[low.bit_length() - 1] = height - y
+            new ^= low
+        seen |= row
+    bumpiness = 0
+    for c in range(width - 1):
+        bumpiness += abs(heights[c] - heights[c + 1])
+    return (weights['holes'] * holes
+            + weights['aggregate_height'] * sum(heights)
+            + weights['bumpiness'] * bumpiness
+            + weights['lines'] * lines)
+
+def placements(rows, width, shape_idx, spawn=None, start_rotation=0):
+    """枚举方块从出生位置旋转、平移后直落能到达的所有最终落点
+
+    逐个返回 (rotation, x, y, new_rows, lines)，new_rows 为落定并消行后的行位图元组。
+    """
+    full_row = (1 << width) - 1
+    spawn_x, spawn_y = spawn_offsets(width)[shape_idx] if spawn is None else spawn
+    tops = column_tops(rows, width)
+    # 未去重的旋转状态，用于检查旋转路径上的每一步
+    states = ROTATIONS[shape_idx]
+
+    for placer in PLACERS[shape_idx]:
+        # 在出生位置依次旋转到目标状态，途中每一步都必须合法
+        turns = (placer.rotation - start_rotation) & 3
+        if not all(shape_fits(rows, width, states[(start_rotation + i) & 3], spawn_x, spawn_y)
+                   for i in range(turns + 1)):
+            continue
+
+        # 从出生列向左右平移，遇到阻挡即停止
+        columns = []
+        for step in (-1, 1):
+            x = spawn_x if step < 0 else spawn_x + 1
+            while shape_fits(rows, width, placer.state, x, spawn_y):
+                columns.append(x)
+                x += step
+
+        for x in columns:
+            # 与游戏中的直落使用同一个落地行算法
+            y = landing_y(rows, width, tops, placer.state, x, spawn_y)
+            base = x + placer.left
+            new_rows = list(rows)
+            lines = 0
+            for dy, mask in placer.row_masks:
+                row = new_rows[y + dy] | (mask << base)
+                new_rows[y + dy] = row
+                if row == full_row:
+                    lines += 1
+            if lines:
+                kept = [row for row in new_rows if row != full_row]
+                new_rows = [0] * lines + kept
+            yield placer.rotation, x, y, tuple(new_rows), lines
+
+class TranspositionTable:
+    """有容量上限的 LRU 置换表"""
+    def __init__(self, max_size=100000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+class PlacementAI:
+    """对当前方块（可选再加下一个方块）做落点搜索的 AI"""
+    def __init__(self, weights=None, cache_size=100000):
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self.table = TranspositionTable(cache_size)
+
+    def best_move(self, board, current_block, next_block=None):
+        """返回当前方块的最佳落点 (rotation, x, y)，无处可放时返回 None"""
+        rows = tuple(board.rows)
+        spawn = (current_block.x, current_block.y)
+        start_rotation = current_block.rotation
+        next_idx = None if next_block is None else next_block.shape_idx
+        key = ('move', board.width, rows, current_block.shape_idx, start_rotation,
+               spawn, next_idx)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached[0]
+
+        best = None
+        best_value = float('-inf')
+        for rotation, x, y, new_rows, lines in placements(rows, board.width, current_block.shape_idx,
+                                                           spawn, start_rotation):
+            if next_idx is None:
+                value = evaluate(new_rows, board.width, lines, self.weights)
+            else:
+                value = (self._best_value(new_rows, board.width, next_idx)
+                         + self.weights['lines'] * lines)
+            if best is None or value > best_value:
+                best_value = value
+                best = (rotation, x, y)
+        self.table.put(key, (best,))
+        return best
+
+    def _best_value(self, rows, width, shape_idx):
+        """某个局面下放置一个方块所能得到的最高分"""
+        key = ('value', width, rows, shape_idx)
+        cached = self.table.get(key)
+        if cached is not None:
+            return cached
+        best_value = float('-inf')
+        weights = self.weights
+        for _, _, _, new_rows, lines in placements(rows, width, shape_idx):
+            value = evaluate(new_rows, width, lines, weights)
+            if value > best_value:
+                best_value = value
+        self.table.put(key, best_value)
+        return best_value
+
+def plan_actions(block, move):
+    """把目标落点转换成从方块当前状态出发的动作序列"""
+    rotation, x, _ = move
+    actions = [Action.ROTATE] * ((rotation - block.rotation) & 3)
+    dx = x - block.x
+    actions += [Action.RIGHT if dx > 0 else Action.LEFT] * abs(dx)
+    actions.append(Action.HARD_DROP)
+    return actions
@@ -0,0 +1,157 @@
+import numpy as np
+
+from .block import SHAPES, ROTATIONS, spawn_offsets
+from .board import LINE_SCORES
+from .core import Action
+
+# 预计算查找表：CELL_DX/CELL_DY[shape_idx, rotation] 为该状态四个格子的偏移
+CELL_DX = np.array([[[dx for dx, _ in state.cells] for state in states]
+                    for states in ROTATIONS], dtype=np.int32)
+CELL_DY = np.array([[[dy for _, dy in state.cells] for state in states]
+                    for states in ROTATIONS], dtype=np.int32)
+SCORE_TABLE = np.array(LINE_SCORES, dtype=np.int64)
+
+class BatchBoard:
+    """用一个 NumPy 数组同时模拟 N 个游戏板
+
+    cells[i, y, x] 为 0 表示空格，否则为 shape_idx + 1（即 BLOCK_COLORS 的下标加一）。
+    每次 step 对应一次重力下落：先执行动作，再让所有方块下落一格，
+    落不下去的方块锁定、消行并生成下一个方块，规则与 Board/GameCore 一致。
+    """
+    def __init__(self, n, width=10, height=20, seed=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        spawn = spawn_offsets(width)
+        self.spawn_x = np.array([x for x, _ in spawn], dtype=np.int32)
+        self.spawn_y = np.array([y for _, y in spawn], dtype=np.int32)
+        self.rng = np.random.default_rng(seed)
+        self.cells = np.zeros((n, height, width), dtype=np.uint8)
+        # 每个游戏板当前方块的状态，以平行数组保存
+        self.shape_idx = np.zeros(n, dtype=np.int32)
+        self.rotation = np.zeros(n, dtype=np.int32)
+        self.x = np.zeros(n, dtype=np.int32)
+        self.y = np.zeros(n, dtype=np.int32)
+        self.next_idx = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.pieces = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def reset(self, mask=None):
+        """重置全部或 mask 选中的游戏板"""
+        idx = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        self.cells[idx] = 0
+        self.score[idx] = 0
+        self.lines[idx] = 0
+        self.pieces[idx] = 0
+        self.game_over[idx] = False
+        self.next_idx[idx] = self._random_shapes(idx.size)
+        self._spawn(idx)
+
+    def _random_shapes(self, count):
+        return self.rng.integers(0, len(SHAPES), size=count, dtype=np.int32)
+
+    def _fits(self, idx, shape_idx, rotation, x, y):
+        """批量检查方块状态是否越界或与已有方块重叠"""
+        xs = x[:, None] + CELL_DX[shape_idx, rotation]
+        ys = y[:, None] + CELL_DY[shape_idx, rotation]
+        inside = ((xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)).all(axis=1)
+        xs = np.clip(xs, 0, self.width - 1)
+        ys = np.clip(ys, 0, self.height - 1)
+        hit = (self.cells[idx[:, None], ys, xs] != 0).any(axis=1)
+        return inside & ~hit
+
+    def _fits_current(self, idx, dx=0, dy=0, rotation=None):
+        if rotation is None:
+            rotation = self.rotation[idx]
+        return self._fits(idx, self.shape_idx[idx], rotation,
+                          self.x[idx] + dx, self.y[idx] + dy)
+
+    def _spawn(self, idx):
+        """把下一个方块变为当前方块，放不下的游戏板判为结束"""
+        shape_idx = self.next_idx[idx]
+        self.shape_idx[idx] = shape_idx
+        self.rotation[idx] = 0
+        self.x[idx] = self.spawn_x[shape_idx]
+        self.y[idx] = self.spawn_y[shape_idx]
+        self.next_idx[idx] = self._random_shapes(idx.size)
+        self.game_over[idx] = ~self._fits_current(idx)
+
+    def _lock(self, idx, lines):
+        """锁定方块、消行计分并生成下一个方块"""
+        shape_idx = self.shape_idx[idx]
+        rotation = self.rotation[idx]
+        xs = self.x[idx, None] + CELL_DX[shape_idx, rotation]
+        ys = self.y[idx, None] + CELL_DY[shape_idx, rotation]
+        self.cells[idx[:, None], ys, xs] = (shape_idx + 1)[:, None]
+
+        cleared = self._clear_lines(idx)
+        lines[idx] += cleared
+        self.lines[idx] += cleared
+        self.score[idx] += SCORE_TABLE[cleared]
+        self.pieces[idx] += 1
+        self._spawn(idx)
+
+    def _clear_lines(self, idx):
+        """清除已填满的行，返回每个游戏板消除的行数"""
+        full = (self.cells[idx] != 0).all(axis=2)
+        cleared = full.sum(axis=1)
+        has = np.flatnonzero(cleared)
+        if has.size:
+            # 稳定排序把满行移到顶部，其余行保持原有顺序，再把顶部的满行清空
+            order = np.argsort(~full[has], axis=1, kind='stable')
+            boards = idx[has]
+            moved = np.take_along_axis(self.cells[boards], order[:, :, None], axis=1)
+            moved[np.arange(self.height)[None, :] < cleared[has, None]] = 0
+            self.cells[boards] = moved
+        return cleared
+
+    def _live(self, actions, action):
+        return np.flatnonzero(~self.game_over & (actions == action))
+
+    def step(self, actions):
+        """对所有游戏板执行一组动作并下落一格，返回每个游戏板本步消除的行数"""
+        actions = np.broadcast_to(np.asarray(actions), (self.n,))
+        lines = np.zeros(self.n, dtype=np.int64)
+
+        # 左右移动
+        for action, dx in ((Action.LEFT, -1), (Action.RIGHT, 1)):
+            idx = self._live(actions, action)
+            if idx.size:
+                ok = self._fits_current(idx, dx=dx)
+                self.x[idx[ok]] += dx
+
+        # 旋转，不合法则保持原状态
+        idx = self._live(actions, Action.ROTATE)
+        if idx.size:
+            rotation = (self.rotation[idx] + 1) & 3
+            ok = self._fits_current(idx, rotation=rotation)
+            self.rotation[idx[ok]] = rotation[ok]
+
+        # 软降落：额外下落一格，但不在此处锁定
+        idx = self._live(actions, Action.SOFT_DROP)
+        if idx.size:
+            ok = self._fits_current(idx, dy=1)
+            self.y[idx[ok]] += 1
+
+        # 硬降落：逐行推进仍能下落的游戏板，直到全部落地后锁定
+        idx = self._live(actions, Action.HARD_DROP)
+        if idx.size:
+            falling = idx
+            while falling.size:
+                ok = self._fits_current(falling, dy=1)
+                falling = falling[ok]
+                self.y[falling] += 1
+            self._lock(idx, lines)
+
+        # 重力
+        idx = np.flatnonzero(~self.game_over)
+        if idx.size:
+            ok = self._fits_current(idx, dy=1)
+            self.y[idx[ok]] += 1
+            landed = idx[~ok]
+            if landed.size:
+                self._lock(landed, lines)
+        return lines
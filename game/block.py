@@ -40,53 +40,111 @@ SHAPES = [
     ]
 ]
 
+def _rotate_cw(shape):
+    """返回顺时针旋转后的新矩阵"""
+    rows = len(shape)
+    cols = len(shape[0])
+    rotated = [[0 for _ in range(rows)] for _ in range(cols)]
+    for r in range(rows):
+        for c in range(cols):
+            rotated[c][rows - 1 - r] = shape[r][c]
+    return rotated
+
+class RotationState:
+    """某个方块在某一旋转状态下的预计算数据"""
+    def __init__(self, shape):
+        self.shape = tuple(tuple(row) for row in shape)
+        # 相对方块左上角的格子偏移 (dx, dy)
+        self.cells = tuple((x, y)
+                           for y, row in enumerate(shape)
+                           for x, filled in enumerate(row) if filled)
+        xs = [x for x, _ in self.cells]
+        ys = [y for _, y in self.cells]
+        # 包围盒 (left, top, right, bottom)，均为闭区间
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        left = self.bbox[0]
+        # 每个非空行的位掩码 (dy, mask)，第 0 位对应包围盒最左列
+        masks = {}
+        for x, y in self.cells:
+            masks[y] = masks.get(y, 0) | (1 << (x - left))
+        self.row_masks = tuple(sorted(masks.items()))
+        # 按行分组的格子 (dy, mask, (dx, ...))，锁定方块时逐行写入
+        self.row_cells = tuple((dy, mask, tuple(x for x, y in self.cells if y == dy))
+                               for dy, mask in self.row_masks)
+        # 包围盒内每一列（从左到右）最靠下的格子的 dy，用于由列高直接算出落地行
+        bottoms = {}
+        for x, y in self.cells:
+            bottoms[x - left] = max(bottoms.get(x - left, y), y)
+        self.bottoms = tuple(bottoms[c] for c in range(self.bbox[2] - left + 1))
+
+def _build_rotations(shape):
+    states = []
+    for _ in range(4):
+        states.append(RotationState(shape))
+        shape = _rotate_cw(shape)
+    return tuple(states)
+
+# 每种方块四个旋转状态的查找表：ROTATIONS[shape_idx][rotation]
+ROTATIONS = tuple(_build_rotations(shape[0]) for shape in SHAPES)
+
+def spawn_offsets(width):
+    """每种方块的出生位置 (x, y)：让初始状态在 width 列宽的游戏板上水平居中"""
+    return tuple(
+        ((width - (states[0].bbox[2] - states[0].bbox[0] + 1)) // 2 - states[0].bbox[0], 0)
+        for states in ROTATIONS
+    )
+
+# 标准 10 列宽游戏板上的出生位置
+SPAWN_OFFSETS = spawn_offsets(10)
+
 class Block:
-    def __init__(self):
-        # 随机选择一个方块类型
-        self.shape_idx = random.randint(0, len(SHAPES) - 1)
-        self.shape = SHAPES[self.shape_idx][0]
-        self.color = BLOCK_COLORS[self.shape_idx]
+    def __init__(self, shape_idx=None):
+        # 未指定类型时随机选择一个方块类型
+        if shape_idx is None:
+            shape_idx = random.randint(0, len(SHAPES) - 1)
+        self.reset(shape_idx)
+
+    def reset(self, shape_idx):
+        """把方块重置为指定类型的初始状态"""
+        self.shape_idx = shape_idx
+        self.color = BLOCK_COLORS[shape_idx]
         self.rotation = 0
         # 初始位置（居中）
-        self.x = 3
-        self.y = 0
+        self.x, self.y = SPAWN_OFFSETS[shape_idx]
+
+    @classmethod
+    def from_placement(cls, placement):
+        """由 (shape_idx, rotation, x, y) 创建方块"""
+        shape_idx, rotation, x, y = placement
+        block = cls(shape_idx)
+        block.rotation = rotation
+        block.x = x
+        block.y = y
+        return block
+
+    @property
+    def placement(self):
+        """方块的类型、旋转和位置 (shape_idx, rotation, x, y)"""
+        return self.shape_idx, self.rotation, self.x, self.y
+
+    @property
+    def state(self):
+        """当前旋转状态的预计算数据"""
+        return ROTATIONS[self.shape_idx][self.rotation]
+
+    @property
+    def shape(self):
+        return ROTATIONS[self.shape_idx][self.rotation].shape
 
     def rotate(self):
         """顺时针旋转方块"""
-        # 保存旧的形状以便需要时恢复
-        self.old_shape = [row[:] for row in self.shape]
-        
-        # 获取矩阵尺寸
-        rows = len(self.shape)
-        cols = len(self.shape[0])
-        
-        # 创建新的旋转后的形状
-        rotated = [[0 for _ in range(rows)] for _ in range(cols)]
-        
-        # 执行旋转变换
-        for r in range(rows):
-            for c in range(cols):
-                rotated[c][rows - 1 - r] = self.shape[r][c]
-        
-        # 更新形状
-        self.shape = rotated
-        
-        # 保存旧的位置以便需要时恢复
-        self.old_x = self.x
-        self.old_y = self.y
+        self.rotation = (self.rotation + 1) & 3
 
     def rotate_back(self):
         """恢复到旋转前的状态"""
-        if hasattr(self, 'old_shape'):
-            self.shape = self.old_shape
-            self.x = self.old_x
-            self.y = self.old_y
+        self.rotation = (self.rotation - 1) & 3
 
     def get_positions(self):
         """获取方块在游戏板上的所有位置"""
-        positions = []
-        for y in range(len(self.shape)):
-            for x in range(len(self.shape[y])):
-                if self.shape[y][x]:
-                    positions.append((self.x + x, self.y + y))
-        return positions
\ No newline at end of file
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in ROTATIONS[self.shape_idx][self.rotation].cells]
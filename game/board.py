@@ -1,55 +1,162 @@
 from .colors import BLACK
 
+# 一次消除 0~4 行的得分（每次消除的行数越多，得分越高）
+LINE_SCORES = (0, 100, 300, 500, 800)
+
+def column_tops(rows, width, start=0):
+    """返回每一列最上方已占用格子的行号，空列为 len(rows)；start 以上的行必须为空"""
+    return _fill_tops(rows, [len(rows)] * width, start, (1 << width) - 1)
+
+def _fill_tops(rows, tops, start, pending):
+    """从 start 行向下扫描，为 pending 位图中的各列填入最上方已占用格子的行号
+
+    所有列都找到后立即停止；没有找到的列保持 tops 中原来的值。
+    """
+    height = len(rows)
+    y = start
+    while pending and y < height:
+        new = rows[y] & pending
+        if new:
+            pending ^= new
+            while new:
+                low = new & -new
+                tops[low.bit_length() - 1] = y
+                new ^= low
+        y += 1
+    return tops
+
+def shape_fits(rows, width, state, x, y):
+    """检查旋转状态 state 放在 (x, y) 时是否越界或与占用位图 rows 中的方块重叠，rows 的长度即高度"""
+    left, top, right, bottom = state.bbox
+    if x + left < 0 or x + right >= width or y + top < 0 or y + bottom >= len(rows):
+        return False
+    # 逐行用预计算的行掩码与占用位图做按位与
+    shift = x + left
+    for dy, mask in state.row_masks:
+        if rows[y + dy] & (mask << shift):
+            return False
+    return True
+
+def landing_y(rows, width, tops, state, x, y):
+    """返回旋转状态 state 从 (x, y) 直落后所在的行，tops 为各列的最高点（见 column_tops）
+
+    方块在它所占各列的最高点之上时，落地行由列高和方块底部轮廓直接算出；
+    方块钻到了悬空部分下方时才逐行检测。
+    """
+    base = x + state.bbox[0]
+    landing = len(rows)
+    for c, bottom in enumerate(state.bottoms):
+        top = tops[base + c]
+        if top <= y + bottom:
+            while shape_fits(rows, width, state, x, y + 1):
+                y += 1
+            return y
+        landing = min(landing, top - 1 - bottom)
+    return landing
+
 class Board:
-    def __init__(self, width=10, height=20):
+    def __init__(self, width=10, height=20, line_scores=LINE_SCORES):
         self.width = width
         self.height = height
-        self.board = [[BLACK for _ in range(width)] for _ in range(height)]
+        # 每行是不可变的元组，锁定方块时只替换被改动的行（写时复制），
+        # 未改动的行可以在历史快照之间共享；所有空行共用同一个元组
+        self.empty_row = (BLACK,) * width
+        self.board = [self.empty_row] * height
+        # 占用位图：每行一个整数，第 x 位为 1 表示该格已被占用，与 board 保持同步
+        self.rows = [0] * height
+        self.full_row = (1 << width) - 1
+        # 每列最上方已占用格子的行号（空列为 height），锁定和消行时更新
+        self.tops = [height] * width
         self.score = 0
+        self.line_scores = line_scores
 
     def is_valid_move(self, block):
         """检查移动是否有效"""
-        positions = block.get_positions()
-        for x, y in positions:
-            if not (0 <= x < self.width and 0 <= y < self.height):
-                return False
-            if y >= 0 and self.board[y][x] != BLACK:
-                return False
-        return True
+        return self.fits(block.state, block.x, block.y)
+
+    def fits(self, state, x, y):
+        """检查某个旋转状态放在 (x, y) 时是否越界或与已有方块重叠"""
+        return shape_fits(self.rows, self.width, state, x, y)
+
+    def drop_y(self, block):
+        """返回方块从当前位置直落后所在的行"""
+        return landing_y(self.rows, self.width, self.tops, block.state, block.x, block.y)
 
     def lock_block(self, block):
-        """将方块锁定在当前位置"""
-        positions = block.get_positions()
-        for x, y in positions:
-            if y >= 0:
-                self.board[y][x] = block.color
-        self.clear_lines()
+        """将方块锁定在当前位置，返回消除的行数"""
+        state = block.state
+        x0, y0 = block.x, block.y
+        shift = x0 + state.bbox[0]
+        color = block.color
+        board = self.board
+        rows = self.rows
+        tops = self.tops
+        full_row = self.full_row
+        # 只有方块占用的行可能被填满
+        full = []
+        for dy, mask, dxs in state.row_cells:
+            y = y0 + dy
+            if y < 0:
+                continue
+            rows[y] |= mask << shift
+            # 写时复制：被改动的行换成新的元组
+            row = list(board[y])
+            for dx in dxs:
+                x = x0 + dx
+                row[x] = color
+                if y < tops[x]:
+                    tops[x] = y
+            board[y] = tuple(row)
+            if rows[y] == full_row:
+                full.append(y)
+        return self._remove_rows(full)
 
     def clear_lines(self):
-        """清除已填满的行并计分"""
-        lines_cleared = 0
-        y = self.height - 1
-        while y >= 0:
-            if all(color != BLACK for color in self.board[y]):
-                lines_cleared += 1
-                # 将上面的行都下��一行
-                for y2 in range(y, 0, -1):
-                    self.board[y2] = self.board[y2-1][:]
-                # 顶部添加新的空行
-                self.board[0] = [BLACK for _ in range(self.width)]
-            else:
-                y -= 1
-        
-        # 计算分数（每次消除的行数越多，得分越高）
-        if lines_cleared == 1:
-            self.score += 100
-        elif lines_cleared == 2:
-            self.score += 300
-        elif lines_cleared == 3:
-            self.score += 500
-        elif lines_cleared == 4:
-            self.score += 800
+        """检查所有行，清除已填满的行并计分，返回消除的行数"""
+        full_row = self.full_row
+        # 最高点以上的行都是空行，只需检查已占用的部分
+        return self._remove_rows([y for y in range(min(self.tops), self.height)
+                                  if self.rows[y] == full_row])
+
+    def _remove_rows(self, full):
+        """移除按行号升序给出的满行并计分，返回消除的行数
+
+        最高点以上全是空行，只需要把最高点到最低满行之间的部分整体替换为
+        "新的空行 + 满行之间的各段"（按切片移动行的引用），其余的行保持不动，
+        耗时与已占用的高度成正比，与游戏板的总高度无关。
+        """
+        lines_cleared = len(full)
+        if lines_cleared:
+            board = self.board
+            rows = self.rows
+            top = min(self.tops)
+            kept_board = [self.empty_row] * lines_cleared
+            kept_rows = [0] * lines_cleared
+            start = top
+            for y in full:
+                kept_board += board[start:y]
+                kept_rows += rows[start:y]
+                start = y + 1
+            board[top:start] = kept_board
+            rows[top:start] = kept_rows
+
+            # 满行在每一列都有格子，最高点在最上面的满行之上的列整体下移；
+            # 最高点正好在该满行上的列，从消行后原满行下方的第一行开始重新查找
+            first = full[0]
+            tops = self.tops
+            pending = 0
+            for x in range(self.width):
+                if tops[x] < first:
+                    tops[x] += lines_cleared
+                else:
+                    tops[x] = self.height
+                    pending |= 1 << x
+            _fill_tops(rows, tops, first + lines_cleared, pending)
+
+        # 计算分数
+        self.score += self.line_scores[lines_cleared]
+        return lines_cleared
 
     def is_game_over(self):
         """检查游戏是否结束"""
-        return any(color != BLACK for color in self.board[0]) 
\ No newline at end of file
+        return self.rows[0] != 0
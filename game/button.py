@@ -1,7 +1,11 @@
 import pygame
-import os
 from .colors import (BUTTON_NORMAL, BUTTON_HOVER, BUTTON_ACTIVE, 
                     TEXT_PRIMARY, TEXT_SECONDARY, NEUTRAL)
+from .fonts import get_font
+from .surface_cache import surface_cache
+
+# 预渲染表面中的透明色，按钮本身不会用到这个颜色
+COLOR_KEY = (255, 0, 255)
 
 class Button:
     def __init__(self, x, y, width, height, text, color=BUTTON_NORMAL, hover_color=BUTTON_HOVER, font_size=36):
@@ -10,7 +14,7 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.active_color = BUTTON_ACTIVE
-        self.font = self._get_font(font_size)
+        self.font = get_font(font_size)
         self.is_hovered = False
         self.is_pressed = False
         
@@ -19,119 +23,91 @@ class Button:
         self.animation_speed = 5
         self.shadow_offset = 4
         self.corner_radius = 10
-
-    def _get_font(self, size):
-        # macOS 系统常用中文字体
-        system_fonts = [
-            'PingFang SC',        # 苹方
-            'STHeiti',            # 华文黑体
-            'Heiti TC',           # 黑体-繁
-            'Hiragino Sans GB',   # 冬青黑体
-            'Apple LiGothic',     # 苹果丽黑
-        ]
-        
-        # 获取系统可用字体列表
-        available_fonts = pygame.font.get_fonts()
-        
-        # 尝试加载系统字体
-        for font_name in system_fonts:
-            try:
-                # 转换字体名称为小写并去除空格，以匹配系统字体列表格式
-                font_key = font_name.lower().replace(' ', '')
-                if font_key in available_fonts:
-                    font = pygame.font.SysFont(font_name, size)
-                    # 测试字体是否能渲染中文
-                    test_surface = font.render('测试', True, (255, 255, 255))
-                    print(f"按钮成功加载字体: {font_name}")
-                    return font
-            except Exception as e:
-                print(f"按钮加载字体 {font_name} 失败: {str(e)}")
-                continue
-        
-        # 如果系统字体都失败了，尝试从固定路径加载字体
-        mac_font_paths = [
-            '/System/Library/Fonts/PingFang.ttc',
-            '/System/Library/Fonts/STHeiti Light.ttc',
-            '/System/Library/Fonts/STHeiti Medium.ttc',
-            '/Library/Fonts/Arial Unicode.ttf'
-        ]
-        
-        for font_path in mac_font_paths:
-            try:
-                if os.path.exists(font_path):
-                    font = pygame.font.Font(font_path, size)
-                    test_surface = font.render('测试', True, (255, 255, 255))
-                    print(f"按钮成功加载字体文件: {font_path}")
-                    return font
-            except Exception as e:
-                print(f"按钮加载字体文件 {font_path} 失败: {str(e)}")
-                continue
-        
-        print("警告: 按钮无法加载中文字体，将使用系统默认字体")
-        return pygame.font.Font(None, size)
+        # 各状态静止时的预渲染表面，键为 (悬停, 按下)
+        self.surfaces = {}
+        # 上一次绘制时的状态和位置
+        self.drawn_state = None
 
     def draw(self, screen):
+        target_color = self.target_color
+        if self.is_animating:
+            # 平滑颜色过渡，过渡期间每帧重新绘制
+            for i in range(3):
+                self.current_color[i] = self._lerp(self.current_color[i], target_color[i], self.animation_speed)
+            self._paint(screen, self.rect, self.current_color)
+        else:
+            # 颜色已到达目标，直接使用该状态预渲染的表面
+            self.current_color = list(target_color)
+            screen.blit(self._state_surface(), self.rect)
+        self.drawn_state = (self.state, self.rect.topleft)
+
+    def _paint(self, surface, rect, color):
+        """在 surface 的 rect 处绘制阴影、背景、边框和文字"""
         # 绘制阴影
-        shadow_rect = self.rect.copy()
+        shadow_rect = rect.copy()
         shadow_rect.y += self.shadow_offset
-        pygame.draw.rect(screen, (0, 0, 0, 128), shadow_rect, border_radius=self.corner_radius)
-
-        # 动画过渡效果
-        target_color = self.hover_color if self.is_hovered else self.color
-        if self.is_pressed:
-            target_color = self.active_color
-        
-        # 平滑颜色过渡
-        for i in range(3):
-            self.current_color[i] = self._lerp(self.current_color[i], target_color[i], self.animation_speed)
+        pygame.draw.rect(surface, (0, 0, 0, 128), shadow_rect, border_radius=self.corner_radius)
 
         # 绘制按钮背景
-        pygame.draw.rect(screen, self.current_color, self.rect, border_radius=self.corner_radius)
-        
+        pygame.draw.rect(surface, color, rect, border_radius=self.corner_radius)
+
         # 绘制按钮边框
         border_color = TEXT_SECONDARY if self.is_hovered else NEUTRAL
-        pygame.draw.rect(screen, border_color, self.rect, 1, border_radius=self.corner_radius)
-        
+        pygame.draw.rect(surface, border_color, rect, 1, border_radius=self.corner_radius)
+
         # 绘制文字
         try:
             text_color = TEXT_PRIMARY if self.is_hovered else TEXT_SECONDARY
-            text_surface = self.font.render(self.text, True, text_color)
-            text_rect = text_surface.get_rect(center=self.rect.center)
+            text_surface = surface_cache.render(self.font, self.text, text_color)
+            text_rect = text_surface.get_rect(center=rect.center)
             if self.is_pressed:
                 text_rect.y += 1
-            screen.blit(text_surface, text_rect)
+            surface.blit(text_surface, text_rect)
         except Exception as e:
             print(f"按钮文字渲染失败: {str(e)}")
 
+    def _state_surface(self):
+        """当前状态（悬停、按下）静止时的完整外观，第一次用到时生成"""
+        surface = self.surfaces.get(self.state)
+        if surface is None:
+            surface = pygame.Surface(self.bounds.size).convert()
+            # 圆角外的区域用透明色填充，贴到屏幕上时露出下面的内容
+            surface.fill(COLOR_KEY)
+            self._paint(surface, self.rect.move(-self.rect.x, -self.rect.y), self.target_color)
+            surface.set_colorkey(COLOR_KEY, pygame.RLEACCEL)
+            self.surfaces[self.state] = surface
+        return surface
+
+    @property
+    def state(self):
+        return (self.is_hovered, self.is_pressed)
+
+    @property
+    def settled(self):
+        """按钮没有在过渡，并且已按当前状态和位置画过；下方内容没变时可以跳过重绘"""
+        return not self.is_animating and self.drawn_state == (self.state, self.rect.topleft)
+
+    @property
+    def target_color(self):
+        """当前状态下颜色过渡的目标颜色"""
+        if self.is_pressed:
+            return self.active_color
+        return self.hover_color if self.is_hovered else self.color
+
+    @property
+    def is_animating(self):
+        """颜色过渡是否仍在进行（与目标相差不到半个色阶即视为结束）"""
+        return any(abs(current - target) >= 0.5
+                   for current, target in zip(self.current_color, self.target_color))
+
     def _lerp(self, start, end, amount):
         # 线性插值函数
         return start + (end - start) * amount / 100
 
-    def handle_event(self, event):
-        # 获取当前鼠标位置
-        mouse_pos = pygame.mouse.get_pos()
-        self.is_hovered = self.rect.collidepoint(mouse_pos)
-        
-        if event.type == pygame.MOUSEBUTTONDOWN:
-            if event.button == 1:  # 左键点击
-                if self.is_hovered:
-                    self.is_pressed = True
-                    return False  # 不要立即返回True，等待鼠标抬起
-        
-        elif event.type == pygame.MOUSEBUTTONUP:
-            if event.button == 1:  # 左键释放
-                was_pressed = self.is_pressed
-                self.is_pressed = False
-                # 只有在按钮被按下并且鼠标仍在按钮上时才触发
-                if was_pressed and self.is_hovered:
-                    return True
-        
-        elif event.type == pygame.MOUSEMOTION:
-            self.is_hovered = self.rect.collidepoint(event.pos)
-            if not self.is_hovered:
-                self.is_pressed = False
-        
-        return False
+    @property
+    def bounds(self):
+        """按钮（含阴影）占用的屏幕区域"""
+        return self.rect.union(self.rect.move(0, self.shadow_offset))
 
     @property
     def y(self):
@@ -27,4 +27,7 @@ BLOCK_COLORS = [
     (10, 132, 255),  # 蓝色
     (191, 90, 242),  # 粉色
     (100, 210, 255), # 青色
-] 
\ No newline at end of file
+]
+
+# 落点预览（影子方块）的颜色：对应方块颜色的暗色版本
+GHOST_COLORS = [tuple(c // 4 for c in color) for color in BLOCK_COLORS] 
\ No newline at end of file
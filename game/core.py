@@ -0,0 +1,146 @@
+from .block import spawn_offsets
+from .board import Board, LINE_SCORES
+from .pieces import PieceGenerator
+
+# 下落间隔（秒）
+NORMAL_FALL_SPEED = 0.5
+# 加速下落时下落速度是正常速度的倍数
+SOFT_DROP_FACTOR = 5
+# 比较累计时间时的容差，避免浮点误差让毫秒级的帧时间提前或推迟一次下落
+TIME_EPSILON = 1e-6
+
+class Action:
+    NONE = 0
+    LEFT = 1
+    RIGHT = 2
+    ROTATE = 3
+    SOFT_DROP = 4          # 按下加速下落
+    SOFT_DROP_RELEASE = 5  # 松开加速下落
+    HARD_DROP = 6
+
+class GameCore:
+    """不依赖 pygame 的游戏规则核心，可在无显示环境下批量运行"""
+    def __init__(self, width=10, height=20, generator=None,
+                 fall_speed=NORMAL_FALL_SPEED, line_scores=LINE_SCORES,
+                 soft_drop_factor=SOFT_DROP_FACTOR):
+        self.width = width
+        self.height = height
+        self.generator = generator if generator is not None else PieceGenerator()
+        # 可选的输入记录器（见 game.replay.Recorder）
+        self.recorder = None
+        # 可选的回退历史（见 game.history.History）
+        self.history = None
+        self.normal_fall_speed = fall_speed
+        self.line_scores = line_scores
+        self.soft_drop_factor = soft_drop_factor
+        # 方块在这个宽度的游戏板上的出生位置
+        self.spawn = spawn_offsets(width)
+        self.reset()
+
+    def reset(self):
+        """开始新的一局"""
+        self.board = Board(self.width, self.height, self.line_scores)
+        self.current_block = self._spawn(self.generator())
+        self.next_block = self.generator()
+        self.fall_time = 0
+        self.elapsed = 0.0
+        self.soft_drop = False
+        self.game_over = False
+        self.pieces = 0
+        self.lines = 0
+
+    @property
+    def score(self):
+        return self.board.score
+
+    @property
+    def fall_speed(self):
+        if self.soft_drop:
+            return self.normal_fall_speed / self.soft_drop_factor
+        return self.normal_fall_speed
+
+    def step(self, action=Action.NONE, dt=0.0):
+        """执行一个动作并推进 dt 秒，返回本步消除的行数"""
+        lines = self.apply(action)
+        if not self.game_over:
+            lines += self.update(dt)
+        return lines
+
+    def apply(self, action):
+        """处理一个玩家动作，返回消除的行数"""
+        if self.game_over:
+            return 0
+        if self.recorder is not None and action != Action.NONE:
+            self.recorder.record(action, self.elapsed)
+        lines = self._apply(action)
+        # 硬降落在锁定方块时已经记录过
+        if (self.history is not None and self.history.record_inputs
+                and action not in (Action.NONE, Action.HARD_DROP)):
+            self.history.record(self)
+        return lines
+
+    def _apply(self, action):
+        """apply 的实际处理，不含记录"""
+        board = self.board
+        block = self.current_block
+        if action == Action.LEFT:
+            block.x -= 1
+            if not board.is_valid_move(block):
+                block.x += 1
+        elif action == Action.RIGHT:
+            block.x += 1
+            if not board.is_valid_move(block):
+                block.x -= 1
+        elif action == Action.ROTATE:
+            # 尝试旋转，如果不合法就恢复
+            block.rotate()
+            if not board.is_valid_move(block):
+                block.rotate_back()
+        elif action == Action.SOFT_DROP:
+            self.soft_drop = True
+        elif action == Action.SOFT_DROP_RELEASE:
+            self.soft_drop = False
+        elif action == Action.HARD_DROP:
+            block.y = board.drop_y(block)
+            self.soft_drop = False
+            self.fall_time = 0
+            return self._lock_current()
+        return 0
+
+    def update(self, dt):
+        """推进重力计时器，返回消除的行数
+
+        计时器按下落间隔累减而不是清零，因此结果只取决于经过的总时间，
+        与这段时间被切分成多少帧无关，回放时可以一次推进到下一个输入事件。
+        """
+        self.elapsed += dt
+        self.fall_time += dt
+        lines = 0
+        while not self.game_over and self.fall_time >= self.fall_speed - TIME_EPSILON:
+            self.fall_time -= self.fall_speed
+            block = self.current_block
+            block.y += 1
+            if not self.board.is_valid_move(block):
+                block.y -= 1
+                lines += self._lock_current()
+        return lines
+
+    def _spawn(self, block):
+        """把方块移到出生位置，返回该方块"""
+        block.x, block.y = self.spawn[block.shape_idx]
+        return block
+
+    def _lock_current(self):
+        """锁定当前方块、生成下一个方块并判断游戏是否结束"""
+        locked = self.current_block
+        lines = self.board.lock_block(locked)
+        self.pieces += 1
+        self.lines += lines
+        self.current_block = self._spawn(self.next_block)
+        # 已锁定的方块对象直接复用为新的下一个方块
+        self.next_block = self.generator(locked)
+        if not self.board.is_valid_move(self.current_block):
+            self.game_over = True
+        if self.history is not None:
+            self.history.record(self)
+        return lines
@@ -0,0 +1,190 @@
+import os
+import random
+
+import numpy as np
+
+from .core import GameCore, Action, NORMAL_FALL_SPEED
+from .pieces import PieceGenerator
+from .snapshot import CELL_CODES, PALETTE
+
+# 动作编号为 0 到 ACTION_COUNT - 1，见 Action
+ACTION_COUNT = Action.HARD_DROP + 1
+# piece 观测中各字段的下标
+PIECE_SHAPE, PIECE_ROTATION, PIECE_X, PIECE_Y, PIECE_NEXT = range(5)
+
+def _pixel_surface(width, height):
+    """像素观测使用的离屏表面；只用 fill 绘制，被 surfarray 视图锁定时也能更新"""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    import pygame
+    return pygame.Surface((width, height), 0, 32)
+
+def _pixel_view(surface):
+    """表面像素的 NumPy 视图，按 [y, x, 通道] 索引"""
+    import pygame
+    return pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)
+
+class TetrisEnv:
+    """Gym 风格的单局环境，规则由 GameCore 提供
+
+    观测是一个字典，其中的数组在整个环境生命周期内保持不变、每步原地更新：
+      board  : (height, width) uint8，0 为空，其余为方块类型 + 1
+      piece  : (5,) int32，当前方块的类型、旋转、x、y 和下一个方块的类型
+      pixels : 可选，(height * cell_size, width * cell_size, 3) uint8，直接引用离屏表面的像素
+    每步只重写行对象发生变化的游戏板行（行是写时复制的不可变元组），不做整板复制。
+    需要保留某一步的观测时请自行 copy()。
+
+    step 先执行动作再推进 dt 秒，默认每步下落一格；奖励为本步得分。
+    """
+    def __init__(self, width=10, height=20, seed=None, dt=NORMAL_FALL_SPEED,
+                 pixels=False, cell_size=4):
+        self.width = width
+        self.height = height
+        self.dt = dt
+        self.cell_size = cell_size
+        self.core = GameCore(width, height, PieceGenerator(seed))
+        surface = None
+        if pixels:
+            surface = _pixel_surface(width * cell_size, height * cell_size)
+        self._bind(np.zeros((height, width), dtype=np.uint8),
+                   np.zeros(5, dtype=np.int32), surface, 0)
+
+    def _bind(self, board, piece, surface, top):
+        """把观测写入给定的数组和表面区域（VecEnv 用来让各环境共享一块连续内存）"""
+        self.obs = {'board': board, 'piece': piece}
+        self.surface = surface
+        self.top = top
+        if surface is not None:
+            rows = slice(top, top + self.height * self.cell_size)
+            self.obs['pixels'] = _pixel_view(surface)[rows]
+        self._invalidate()
+        self._sync()
+
+    def _invalidate(self):
+        # 上次写入观测的行对象和像素上画出的格子，None 表示需要重写
+        self.synced_rows = [None] * self.height
+        self.shown = [[None] * self.width for _ in range(self.height)]
+        self.piece_rows = set(range(self.height))
+
+    def reset(self, seed=None):
+        """开始新的一局并返回观测；给出 seed 时使用新的方块序列"""
+        if seed is not None:
+            self.core.generator = PieceGenerator(seed)
+        self.core.reset()
+        self._invalidate()
+        self._sync()
+        return self.obs
+
+    def step(self, action):
+        """执行一个动作，返回 (观测, 奖励, 是否结束, 信息)"""
+        reward, lines = self._step(action)
+        core = self.core
+        return self.obs, reward, core.game_over, {'lines': lines, 'score': core.score,
+                                                  'pieces': core.pieces}
+
+    def _step(self, action):
+        core = self.core
+        if core.game_over:
+            return 0, 0
+        score = core.score
+        lines = core.step(action, self.dt)
+        self._sync()
+        return core.score - score, lines
+
+    def _sync(self):
+        """把 GameCore 的状态写入观测数组"""
+        core = self.core
+        board = self.obs['board']
+        rows = core.board.board
+        synced = self.synced_rows
+        changed = []
+        for y in range(self.height):
+            row = rows[y]
+            if row is not synced[y]:
+                synced[y] = row
+                board[y] = [CELL_CODES[color] for color in row]
+                changed.append(y)
+
+        block = core.current_block
+        piece = self.obs['piece']
+        piece[PIECE_SHAPE] = block.shape_idx
+        piece[PIECE_ROTATION] = block.rotation
+        piece[PIECE_X] = block.x
+        piece[PIECE_Y] = block.y
+        piece[PIECE_NEXT] = core.next_block.shape_idx
+
+        if self.surface is not None:
+            self._draw(changed)
+
+    def _draw(self, changed):
+        """在像素表面上重画变化的格子：游戏板改动的行，以及方块新旧位置所在的行"""
+        block = self.core.current_block
+        code = block.shape_idx + 1
+        cells = {}
+        for x, y in block.get_positions():
+            if 0 <= y < self.height:
+                cells[(x, y)] = code
+        piece_rows = {y for _, y in cells}
+
+        board = self.obs['board']
+        shown = self.shown
+        size = self.cell_size
+        fill = self.surface.fill
+        for y in piece_rows.union(changed, self.piece_rows):
+            row = board[y].tolist()
+            last = shown[y]
+            for x in range(self.width):
+                value = cells.get((x, y), row[x])
+                if value != last[x]:
+                    last[x] = value
+                    fill(PALETTE[value], (x * size, self.top + y * size, size, size))
+        self.piece_rows = piece_rows
+
+class VecEnv:
+    """n 个 TetrisEnv 组成的向量环境
+
+    各环境的观测直接写在共享数组的切片上：board 为 (n, height, width)，piece 为 (n, 5)，
+    pixels 为 (n, height * cell_size, width * cell_size, 3)，取出整批观测不需要拼接或复制。
+    结束的环境在 step 中自动重置，返回的观测已经是新一局的开始，结束时的分数在 info['score'] 中。
+    """
+    def __init__(self, n, width=10, height=20, seed=None, dt=NORMAL_FALL_SPEED,
+                 pixels=False, cell_size=4):
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.n = n
+        self.board = np.zeros((n, height, width), dtype=np.uint8)
+        self.piece = np.zeros((n, 5), dtype=np.int32)
+        self.obs = {'board': self.board, 'piece': self.piece}
+        self.surface = None
+        if pixels:
+            # 所有环境画在同一个纵向排列的表面上，像素视图按环境切分后仍是同一块内存
+            rows = height * cell_size
+            self.surface = _pixel_surface(width * cell_size, n * rows)
+            self.obs['pixels'] = _pixel_view(self.surface).reshape(n, rows, width * cell_size, 3)
+
+        self.envs = []
+        for i in range(n):
+            env = TetrisEnv(width, height, seed + i, dt, cell_size=cell_size)
+            env._bind(self.board[i], self.piece[i], self.surface, i * height * cell_size)
+            self.envs.append(env)
+        self.rewards = np.zeros(n, dtype=np.int64)
+        self.dones = np.zeros(n, dtype=bool)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.scores = np.zeros(n, dtype=np.int64)
+
+    def reset(self):
+        """重置所有环境并返回整批观测"""
+        for env in self.envs:
+            env.reset()
+        return self.obs
+
+    def step(self, actions):
+        """每个环境执行一个动作，返回 (观测, 奖励, 是否结束, 信息)，数组每步原地更新"""
+        rewards, dones, lines, scores = self.rewards, self.dones, self.lines, self.scores
+        for i, env in enumerate(self.envs):
+            rewards[i], lines[i] = env._step(int(actions[i]))
+            core = env.core
+            scores[i] = core.score
+            dones[i] = core.game_over
+            if core.game_over:
+                env.reset()
+        return self.obs, rewards, dones, {'lines': lines, 'score': scores}
@@ -0,0 +1,125 @@
+import json
+import os
+import platform
+import sys
+
+import pygame
+
+# macOS 系统常用中文字体
+SYSTEM_FONTS = [
+    'PingFang SC',        # 苹方
+    'STHeiti',            # 华文黑体
+    'Heiti TC',           # 黑体-繁
+    'Hiragino Sans GB',   # 冬青黑体
+    'Apple LiGothic',     # 苹果丽黑
+]
+
+# 系统字体都找不到时尝试的字体文件，最后是 download_font.py 下载的字体
+FONT_PATHS = [
+    '/System/Library/Fonts/PingFang.ttc',
+    '/System/Library/Fonts/STHeiti Light.ttc',
+    '/System/Library/Fonts/STHeiti Medium.ttc',
+    '/Library/Fonts/Arial Unicode.ttf',
+    os.path.join('fonts', 'msyh.ttc'),
+]
+
+# 解析结果按平台保存在磁盘上，之后启动时跳过系统字体扫描
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.tetris_font_cache.json')
+
+# 使用 pygame 默认字体时在缓存中记录的值
+DEFAULT_FONT = ''
+
+_resolved_path = None
+_fonts = {}
+
+def _platform_key():
+    return f"{sys.platform}-{platform.machine()}"
+
+def _can_render(font):
+    """测试字体是否能渲染中文"""
+    font.render('测试', True, (255, 255, 255))
+
+def _scan_font_path():
+    """扫描系统字体，返回第一个能渲染中文的字体文件路径，找不到时返回 DEFAULT_FONT"""
+    # 获取系统可用字体列表（整个进程只扫描一次）
+    available_fonts = pygame.font.get_fonts()
+
+    # 尝试加载系统字体
+    for font_name in SYSTEM_FONTS:
+        try:
+            # 转换字体名称为小写并去除空格，以匹配系统字体列表格式
+            font_key = font_name.lower().replace(' ', '')
+            if font_key in available_fonts:
+                path = pygame.font.match_font(font_name)
+                if path:
+                    _can_render(pygame.font.Font(path, 12))
+                    print(f"成功加载字体: {font_name}")
+                    return path
+        except Exception as e:
+            print(f"加载字体 {font_name} 失败: {str(e)}")
+            continue
+
+    # 如果系统字体都失败了，尝试从固定路径加载字体
+    for font_path in FONT_PATHS:
+        try:
+            if os.path.exists(font_path):
+                _can_render(pygame.font.Font(font_path, 12))
+                print(f"成功加载字体文件: {font_path}")
+                return os.path.abspath(font_path)
+        except Exception as e:
+            print(f"加载字体文件 {font_path} 失败: {str(e)}")
+            continue
+
+    print("警告: 无法加载中文字体，将使用系统默认字体")
+    return DEFAULT_FONT
+
+def _load_cache():
+    try:
+        with open(CACHE_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_cache(cache):
+    try:
+        with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"保存字体缓存失败: {str(e)}")
+
+def resolve_font_path():
+    """返回本机使用的中文字体路径（DEFAULT_FONT 表示 pygame 默认字体）
+
+    每个进程只解析一次；结果写入磁盘缓存，缓存中的文件仍然存在时直接使用。
+    缓存的是默认字体时，只要 FONT_PATHS 中出现了字体文件（例如 download_font.py 下载的）就重新扫描。
+    """
+    global _resolved_path
+    if _resolved_path is not None:
+        return _resolved_path
+
+    cache = _load_cache()
+    key = _platform_key()
+    path = cache.get(key)
+    if path == DEFAULT_FONT:
+        stale = any(os.path.exists(font_path) for font_path in FONT_PATHS)
+    else:
+        stale = path is None or not os.path.exists(path)
+    if stale:
+        path = _scan_font_path()
+        cache[key] = path
+        _save_cache(cache)
+    _resolved_path = path
+    return path
+
+def get_font(size):
+    """按字号返回共享的字体对象"""
+    font = _fonts.get(size)
+    if font is None:
+        path = resolve_font_path()
+        try:
+            font = pygame.font.Font(path or None, size)
+        except Exception as e:
+            print(f"加载字体文件 {path} 失败: {str(e)}")
+            font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
@@ -0,0 +1,124 @@
+from collections import deque
+
+from .block import Block
+from .board import column_tops
+from .colors import BLACK
+
+# 每生成多少个方块保存一次随机数生成器的完整状态，回退时从最近的检查点重新推进
+RNG_CHECKPOINT_INTERVAL = 256
+
+class HistoryEntry:
+    """回退历史中的一条记录
+
+    board 是游戏板各行的元组；行本身是不可变元组，未改动的行与相邻记录共享同一个对象。
+    占用位图和列高在恢复时由 board 重新算出，不额外保存。
+    """
+    __slots__ = ('board', 'score', 'pieces', 'lines', 'elapsed', 'game_over',
+                 'current', 'next', 'checkpoint', 'drawn')
+
+def _row_mask(row):
+    mask = 0
+    for x, color in enumerate(row):
+        if color != BLACK:
+            mask |= 1 << x
+    return mask
+
+class History:
+    """有界的回退历史，用于训练模式中后退、前进
+
+    每次方块锁定后记录一次（record_inputs 为 True 时每个输入也记录一次），最多保留 depth 条，
+    超出时丢弃最早的记录。后退之后继续游戏会丢弃当前位置之后的记录。
+    """
+    def __init__(self, depth=10000, record_inputs=False):
+        self.entries = deque(maxlen=depth)
+        self.record_inputs = record_inputs
+        # 当前所在记录的下标
+        self.cursor = -1
+        # 最近的随机数检查点 (已生成方块数, 生成器状态)，被多条记录共享
+        self.checkpoint = None
+
+    @classmethod
+    def attach(cls, core, depth=10000, record_inputs=False):
+        """为游戏创建回退历史，记录当前状态并挂到 GameCore 上"""
+        history = cls(depth, record_inputs)
+        core.history = history
+        history.record(core)
+        return history
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def can_undo(self):
+        return self.cursor > 0
+
+    @property
+    def can_redo(self):
+        return self.cursor < len(self.entries) - 1
+
+    def record(self, core):
+        """在当前位置之后追加一条记录"""
+        entries = self.entries
+        while len(entries) > self.cursor + 1:
+            entries.pop()
+
+        # 方块序列只取决于种子和已生成的个数，任何检查点之后的位置都可以从它推进得到
+        generator = core.generator
+        if self.checkpoint is None or not 0 <= generator.drawn - self.checkpoint[0] < RNG_CHECKPOINT_INTERVAL:
+            self.checkpoint = (generator.drawn, generator.getstate())
+
+        board = core.board
+        entry = HistoryEntry()
+        entry.board = tuple(board.board)
+        entry.score = board.score
+        entry.pieces = core.pieces
+        entry.lines = core.lines
+        entry.elapsed = core.elapsed
+        entry.game_over = core.game_over
+        entry.current = core.current_block.placement
+        entry.next = core.next_block.placement
+        entry.checkpoint = self.checkpoint
+        entry.drawn = generator.drawn
+        entries.append(entry)
+        self.cursor = len(entries) - 1
+
+    def undo(self, core):
+        """后退一步，返回是否成功"""
+        if not self.can_undo:
+            return False
+        self.cursor -= 1
+        self._restore(core, self.entries[self.cursor])
+        return True
+
+    def redo(self, core):
+        """前进一步，返回是否成功"""
+        if not self.can_redo:
+            return False
+        self.cursor += 1
+        self._restore(core, self.entries[self.cursor])
+        return True
+
+    def _restore(self, core, entry):
+        board = core.board
+        board.board[:] = entry.board
+        # 空行共用同一个元组，不需要逐格计算
+        empty_row = board.empty_row
+        board.rows[:] = [0 if row is empty_row else _row_mask(row) for row in entry.board]
+        board.tops = column_tops(board.rows, board.width)
+        board.score = entry.score
+        core.pieces = entry.pieces
+        core.lines = entry.lines
+        core.elapsed = entry.elapsed
+        core.game_over = entry.game_over
+        core.fall_time = 0
+        core.soft_drop = False
+        # 新建方块对象，按对象身份缓存的数据（例如自动游戏的规划）会随之失效
+        core.current_block = Block.from_placement(entry.current)
+        core.next_block = Block.from_placement(entry.next)
+
+        generator = core.generator
+        drawn, state = entry.checkpoint
+        generator.setstate(state)
+        generator.drawn = drawn
+        while generator.drawn < entry.drawn:
+            generator.next_shape()
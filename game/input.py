@@ -0,0 +1,91 @@
+from collections import deque
+
+from .core import Action
+
+# 按住左右键后开始自动重复前的延迟（DAS）和自动重复的间隔（ARR），单位毫秒
+DAS_MS = 150
+ARR_MS = 50
+
+class InputEngine:
+    """把带时间戳的按键事件转换为按时间排序的游戏动作
+
+    按下左右键立即移动一格，按住 das_ms 毫秒后每隔 arr_ms 毫秒再移动一格（arr_ms 为 0 时按 1 毫秒处理，
+    几乎立即移到墙边）；同时按住左右键时以后按下的为准。其余按键在按下时产生一个动作，
+    松开加速下落键时产生 SOFT_DROP_RELEASE。
+
+    时间戳由 FrameScheduler 在事件到达时记录（event.time_ms），主循环在每个逻辑步之前取出
+    该步结束前发生的动作，同一帧内的多次输入按实际先后与重力交错执行，而不是都堆到帧首。
+    """
+    def __init__(self, key_actions, das_ms=DAS_MS, arr_ms=ARR_MS):
+        self.key_actions = key_actions
+        self.das_ms = das_ms
+        self.arr_ms = max(1, arr_ms)
+        self.reset()
+
+    def reset(self):
+        """丢弃未执行的动作，并忘记按住的左右键（例如暂停时）
+
+        只清空输入引擎自己的状态，不产生任何动作；加速下落需要由调用方向游戏发送 SOFT_DROP_RELEASE。
+        """
+        # 待执行的 (时间, 动作, 是否来自按键事件)，按时间排序
+        self.pending = deque()
+        # 按住的左右移动，最后一个为当前生效的方向
+        self.held = []
+        self.next_shift = None
+        # 已执行、尚未显示到屏幕上的按键事件的时间戳
+        self.applied = []
+
+    def key_down(self, key, time_ms):
+        """处理按下事件，返回该键是否由输入引擎处理"""
+        action = self.key_actions.get(key)
+        if action is None:
+            return False
+        self._shift_until(time_ms)
+        self.pending.append((time_ms, action, True))
+        if action in (Action.LEFT, Action.RIGHT):
+            if action in self.held:
+                self.held.remove(action)
+            self.held.append(action)
+            self.next_shift = time_ms + self.das_ms
+        return True
+
+    def key_up(self, key, time_ms):
+        """处理松开事件，返回该键是否由输入引擎处理"""
+        action = self.key_actions.get(key)
+        if action is None:
+            return False
+        self._shift_until(time_ms)
+        if action == Action.SOFT_DROP:
+            self.pending.append((time_ms, Action.SOFT_DROP_RELEASE, True))
+        elif action in self.held:
+            self.held.remove(action)
+            # 仍按着另一个方向时，从松开的时刻重新开始计算延迟
+            self.next_shift = time_ms + self.das_ms if self.held else None
+        return True
+
+    def _shift_until(self, time_ms):
+        """生成 time_ms 之前（含）到期的自动重复移动"""
+        if not self.held:
+            return
+        action = self.held[-1]
+        while self.next_shift <= time_ms:
+            self.pending.append((self.next_shift, action, False))
+            self.next_shift += self.arr_ms
+
+    def actions(self, until_ms):
+        """按时间顺序返回 until_ms 之前（含）应执行的动作"""
+        self._shift_until(until_ms)
+        pending = self.pending
+        actions = []
+        while pending and pending[0][0] <= until_ms:
+            time_ms, action, from_key = pending.popleft()
+            actions.append(action)
+            if from_key:
+                self.applied.append(time_ms)
+        return actions
+
+    def take_applied(self):
+        """返回并清空已执行的按键事件时间戳，画面刷新后用来计算输入延迟"""
+        applied = self.applied
+        self.applied = []
+        return applied
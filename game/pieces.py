@@ -0,0 +1,46 @@
+import random
+
+from .block import Block, SHAPES
+
+class PieceGenerator:
+    """可设定随机种子的方块序列生成器，支持均匀随机和 7-bag 两种模式"""
+    UNIFORM = 'uniform'
+    BAG = 'bag'
+
+    def __init__(self, seed=None, mode=UNIFORM):
+        if mode not in (self.UNIFORM, self.BAG):
+            raise ValueError(f"未知的方块生成模式: {mode}")
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.seed = seed
+        self.mode = mode
+        self.rng = random.Random(seed)
+        self.bag = []
+        # 已生成的方块数，回退历史时用来从随机数检查点重新推进到同一位置
+        self.drawn = 0
+
+    def next_shape(self):
+        """返回下一个方块类型的下标"""
+        self.drawn += 1
+        if self.mode == self.BAG:
+            # 每 7 个方块为一袋，袋内每种方块恰好出现一次
+            if not self.bag:
+                self.bag = list(range(len(SHAPES)))
+                self.rng.shuffle(self.bag)
+            return self.bag.pop()
+        return self.rng.randrange(len(SHAPES))
+
+    def __call__(self, block=None):
+        """生成下一个方块；传入旧的 Block 时原地复用，避免每个方块都新建对象"""
+        if block is None:
+            return Block(self.next_shape())
+        block.reset(self.next_shape())
+        return block
+
+    def getstate(self):
+        return self.rng.getstate(), tuple(self.bag)
+
+    def setstate(self, state):
+        rng_state, bag = state
+        self.rng.setstate(rng_state)
+        self.bag = list(bag)
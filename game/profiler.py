@@ -0,0 +1,138 @@
+import csv
+import json
+import time
+from collections import deque
+
+import pygame
+from .colors import BLACK, WHITE
+from .stats import percentile
+
+# 主循环的各个阶段：事件轮询、按钮事件分发、游戏逻辑、游戏板绘制、文字和按钮绘制、刷新屏幕
+PHASES = ('events', 'buttons', 'update', 'board', 'hud', 'flip')
+
+class FrameProfiler:
+    """按阶段统计主循环每帧的耗时
+
+    阶段可以嵌套，嵌套的阶段开始后外层阶段暂停计时，因此各阶段的时间互不重叠。
+    未启用时 start/stop 不做任何事。
+    """
+    def __init__(self, enabled=False, fps=60, max_samples=3600):
+        self.enabled = enabled
+        self.frame_budget = 1000 / fps
+        self.samples = {phase: deque(maxlen=max_samples) for phase in PHASES}
+        self.frame_times = deque(maxlen=max_samples)
+        # 按键事件到达到结果刷新到屏幕之间的延迟
+        self.input_latency = deque(maxlen=max_samples)
+        self.current = dict.fromkeys(PHASES, 0.0)
+        self.stack = []
+        self.mark = 0.0
+        self.frames = 0
+        self.dropped_frames = 0
+        self.last_frame = None
+        self.overlay_visible = False
+        self.overlay = None
+        self.overlay_time = 0.0
+
+    def start(self, phase):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.stack:
+            self.current[self.stack[-1]] += now - self.mark
+        self.stack.append(phase)
+        self.mark = now
+
+    def stop(self):
+        if not self.enabled or not self.stack:
+            return
+        now = time.perf_counter()
+        self.current[self.stack.pop()] += now - self.mark
+        self.mark = now
+
+    def end_frame(self, active=True):
+        """结束一帧；active 为 False（空闲等待）的帧不计入掉帧"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        for phase in PHASES:
+            self.samples[phase].append(self.current[phase] * 1000)
+            self.current[phase] = 0.0
+        if self.last_frame is not None and active:
+            frame_ms = (now - self.last_frame) * 1000
+            self.frame_times.append(frame_ms)
+            if frame_ms > self.frame_budget * 1.5:
+                self.dropped_frames += 1
+        self.last_frame = now
+        self.frames += 1
+
+    def record_latency(self, latency_ms):
+        """记录一次输入到画面的延迟（毫秒）"""
+        if self.enabled:
+            self.input_latency.append(latency_ms)
+
+    def toggle_overlay(self):
+        """切换性能浮层，第一次打开时同时开始统计"""
+        self.enabled = True
+        self.overlay_visible = not self.overlay_visible
+        self.overlay = None
+
+    def stats(self):
+        """返回各阶段、整帧耗时以及输入延迟（毫秒）的分布"""
+        result = {}
+        series = dict(self.samples)
+        series['frame'] = self.frame_times
+        series['input'] = self.input_latency
+        for name, samples in series.items():
+            values = sorted(samples)
+            result[name] = {
+                'count': len(values),
+                'mean': sum(values) / len(values) if values else 0.0,
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'p99': percentile(values, 99),
+                'max': values[-1] if values else 0.0,
+            }
+        return result
+
+    def export(self, path):
+        """把统计结果写入 JSON 或 CSV 文件（由扩展名决定）"""
+        stats = self.stats()
+        try:
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                if path.endswith('.csv'):
+                    writer = csv.writer(f)
+                    writer.writerow(['phase', 'count', 'mean', 'p50', 'p95', 'p99', 'max'])
+                    for name, s in stats.items():
+                        writer.writerow([name, s['count'], round(s['mean'], 4), round(s['p50'], 4),
+                                         round(s['p95'], 4), round(s['p99'], 4), round(s['max'], 4)])
+                    writer.writerow(['dropped_frames', self.dropped_frames, '', '', '', '', ''])
+                else:
+                    json.dump({'frames': self.frames, 'dropped_frames': self.dropped_frames,
+                               'phases': stats}, f, ensure_ascii=False, indent=2)
+            print(f"性能统计已写入: {path}")
+        except OSError as e:
+            print(f"保存性能统计失败: {str(e)}")
+
+    def overlay_surface(self, font):
+        """返回性能浮层的 Surface，每半秒更新一次内容"""
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_time > 0.5:
+            stats = self.stats()
+            lines = [f"{'phase':<8}{'p50':>8}{'p95':>8}{'p99':>8}"]
+            for name in PHASES + ('frame', 'input'):
+                s = stats[name]
+                lines.append(f"{name:<8}{s['p50']:8.2f}{s['p95']:8.2f}{s['p99']:8.2f}")
+            lines.append(f"dropped {self.dropped_frames} / {self.frames}")
+            rendered = [font.render(line, True, WHITE) for line in lines]
+            # 浮层只变宽不变窄，脏矩形刷新时不会留下旧内容
+            width = max(surface.get_width() for surface in rendered) + 12
+            if self.overlay is not None:
+                width = max(width, self.overlay.get_width())
+            line_height = font.get_linesize()
+            self.overlay = pygame.Surface((width, line_height * len(rendered) + 12))
+            self.overlay.fill(BLACK)
+            self.overlay.set_alpha(200)
+            for i, surface in enumerate(rendered):
+                self.overlay.blit(surface, (6, 6 + i * line_height))
+            self.overlay_time = now
+        return self.overlay
@@ -0,0 +1,246 @@
+import pygame
+from .colors import BLACK, WHITE, BLOCK_COLORS, GHOST_COLORS
+from .surface_cache import surface_cache
+
+# 视口跟随当前方块滚动时，方块与视口左、右、上边缘至少保持的格数
+SCROLL_MARGIN = 2
+
+class TileAtlas(dict):
+    """预渲染的格子贴图：颜色 -> 已 convert 的 Surface
+
+    方块带有亮边和暗边；空格是纯黑的贴图。创建时生成所有方块颜色和影子颜色，
+    其他颜色在第一次用到时生成。
+    """
+    def __init__(self, size):
+        super().__init__()
+        self.size = size
+        empty = pygame.Surface((size, size)).convert()
+        empty.fill(BLACK)
+        self[BLACK] = empty
+        for color in BLOCK_COLORS + GHOST_COLORS:
+            self[color] = self._render(color)
+
+    def _render(self, color):
+        size = self.size
+        tile = pygame.Surface((size, size)).convert()
+        tile.fill(color)
+        edge = max(1, size // 8)
+        light = tuple(c + (255 - c) * 2 // 5 for c in color)
+        dark = tuple(c * 3 // 5 for c in color)
+        tile.fill(light, (0, 0, size, edge))
+        tile.fill(light, (0, 0, edge, size))
+        tile.fill(dark, (0, size - edge, size, edge))
+        tile.fill(dark, (size - edge, edge, edge, size - edge))
+        return tile
+
+    def __missing__(self, color):
+        tile = self[color] = self._render(color)
+        return tile
+
+class BoardRenderer:
+    """游戏画面的脏矩形渲染器
+
+    边框、"下一个"标题等静态内容只在 static 图层上绘制一次；scene 图层保存当前的完整画面，
+    每帧只重绘发生变化的格子、预览区和分数区域，并把这些区域复制到屏幕上，
+    返回的矩形列表交给 pygame.display.update 只刷新这些区域。
+
+    view_size 为 (列数, 行数) 时只显示游戏板中这么大的一块（视口），视口跟随当前方块滚动，
+    每帧只遍历视口内的行和列，绘制的耗时与游戏板的大小无关；为 None 时显示整个游戏板。
+    """
+    def __init__(self, screen, font, offset, block_size, preview_pos, next_label, next_label_pos,
+                 score_label, score_pos, profiler=None, view_size=None):
+        self.screen = screen
+        self.font = font
+        self.offset_x, self.offset_y = offset
+        self.block_size = block_size
+        self.preview_pos = preview_pos
+        self.next_label = next_label
+        self.next_label_pos = next_label_pos
+        self.score_label = score_label
+        self.score_pos = score_pos
+        # 可选的 FrameProfiler，分数文字计入 'hud' 阶段
+        self.profiler = profiler
+        self.view_size = view_size
+        self.static = None
+        self.scene = None
+        self.board_size = None
+        self.full_redraw = True
+
+    def invalidate(self):
+        """下一帧整屏重绘（例如游戏状态切换、覆盖层消失时）"""
+        self.full_redraw = True
+
+    def cell_rect(self, x, y):
+        """游戏板上 (x, y) 格在屏幕上的矩形，坐标相对于当前视口"""
+        return pygame.Rect(self.offset_x + (x - self.view_x) * self.block_size,
+                           self.offset_y + (y - self.view_y) * self.block_size,
+                           self.block_size - 1, self.block_size - 1)
+
+    def _build_layers(self, board):
+        """绘制静态图层，并重置所有缓存的状态"""
+        self.board_size = (board.width, board.height)
+        width, height = board.width, board.height
+        if self.view_size is not None:
+            width, height = min(width, self.view_size[0]), min(height, self.view_size[1])
+        # 视口的大小（格）和左上角在游戏板上的位置
+        self.view_width, self.view_height = width, height
+        self.view_x = self.view_y = 0
+        self.static = pygame.Surface(self.screen.get_size()).convert()
+        self.static.fill(BLACK)
+        # 游戏边框
+        pygame.draw.rect(self.static, WHITE,
+                         (self.offset_x - 2, self.offset_y - 2,
+                          width * self.block_size + 4,
+                          height * self.block_size + 4), 2)
+        # "下一个"标题
+        try:
+            self.static.blit(surface_cache.render(self.font, self.next_label, WHITE), self.next_label_pos)
+        except Exception as e:
+            print(f"渲染文字时出错: {str(e)}")
+        self.scene = self.static.copy()
+        self.tiles = TileAtlas(self.block_size - 1)
+        self._reset_cells()
+        self.score = None
+        self.score_rect = pygame.Rect(self.score_pos, (0, 0))
+        self.preview = None
+        self.preview_rect = pygame.Rect(self.preview_pos, (4 * self.block_size, 4 * self.block_size))
+
+    def _reset_cells(self):
+        """清空视口内格子的缓存，下一帧重画视口内的所有格子"""
+        # 上一帧在视口每个位置画出的格子颜色，None 表示尚未绘制
+        self.drawn = [[None] * self.view_width for _ in range(self.view_height)]
+        # 上一帧在视口每一行画出的游戏板行对象；行是不可变元组，同一个对象说明内容没有变化
+        self.drawn_rows = [None] * self.view_height
+        self.piece_rows = set()
+
+    def _scroll(self, board, block):
+        """移动视口使当前方块保持在视口内，视口移动后重画视口内的所有格子
+
+        方块下方保留半个视口的高度，下落时可以看到即将落到的位置。
+        """
+        width, height = self.view_width, self.view_height
+        if block is None or (width, height) == self.board_size:
+            return
+        left, top, right, bottom = block.state.bbox
+        margin_x = max(0, min(SCROLL_MARGIN, (width - 4) // 2))
+        margin_y = max(0, min(SCROLL_MARGIN, (height - 4) // 2))
+        x, y = self.view_x, self.view_y
+        x = max(x, block.x + right + 1 + margin_x - width)
+        x = min(x, block.x + left - margin_x)
+        y = max(y, block.y + bottom + 1 + height // 2 - height)
+        y = min(y, block.y + top - margin_y)
+        x = max(0, min(x, board.width - width))
+        y = max(0, min(y, board.height - height))
+        if (x, y) != (self.view_x, self.view_y):
+            self.view_x, self.view_y = x, y
+            self._reset_cells()
+
+    def draw(self, board, current_block, next_block, show_piece=True):
+        """更新 scene 中变化的部分并复制到屏幕，返回需要刷新的矩形列表"""
+        if self.board_size != (board.width, board.height):
+            self._build_layers(board)
+            self.full_redraw = True
+
+        block = current_block if show_piece else None
+        self._scroll(board, block)
+        dirty = []
+        dirty += self._draw_cells(board, block)
+        if self.profiler is not None:
+            self.profiler.start('hud')
+        dirty += self._draw_score(board.score)
+        if self.profiler is not None:
+            self.profiler.stop()
+        dirty += self._draw_preview(next_block)
+
+        if self.full_redraw:
+            self.full_redraw = False
+            self.screen.blit(self.scene, (0, 0))
+            return [self.screen.get_rect()]
+        for rect in dirty:
+            self.screen.blit(self.scene, rect, rect)
+        return dirty
+
+    def restore(self, rect):
+        """用 scene 中的内容覆盖屏幕上的某个区域（例如重绘按钮之前），返回该区域"""
+        rect = pygame.Rect(rect)
+        self.screen.blit(self.scene, rect, rect)
+        return rect
+
+    def _draw_cells(self, board, block):
+        piece = {}
+        if block is not None:
+            # 影子方块：当前方块直落后的位置，由列高直接算出，每帧绘制
+            ghost_dy = board.drop_y(block) - block.y
+            if ghost_dy:
+                ghost_color = GHOST_COLORS[block.shape_idx]
+                for x, y in block.get_positions():
+                    if 0 <= y + ghost_dy < board.height:
+                        piece[(x, y + ghost_dy)] = ghost_color
+            for x, y in block.get_positions():
+                if 0 <= y < board.height:
+                    piece[(x, y)] = block.color
+        piece_rows = {y for _, y in piece}
+
+        dirty = []
+        # 所有变化的格子收集后用一次 blits 画到 scene 上
+        batch = []
+        tiles = self.tiles
+        size = self.block_size
+        drawn = self.drawn
+        drawn_rows = self.drawn_rows
+        rows = board.board
+        # 只遍历视口内的行和列，视口外的格子（包括方块和影子）不绘制
+        view_x, view_y = self.view_x, self.view_y
+        columns = range(view_x, view_x + self.view_width)
+        for vy in range(self.view_height):
+            y = view_y + vy
+            row = rows[y]
+            last = drawn[vy]
+            # 整行没变且方块既不在这一行、上一帧也不在这一行时直接跳过
+            if row is drawn_rows[vy] and y not in piece_rows and y not in self.piece_rows:
+                continue
+            drawn_rows[vy] = row
+            left = right = None
+            top = self.offset_y + vy * size
+            for x in columns:
+                color = piece.get((x, y), row[x])
+                if color != last[x - view_x]:
+                    last[x - view_x] = color
+                    batch.append((tiles[color], (self.offset_x + (x - view_x) * size, top)))
+                    if left is None:
+                        left = x
+                    right = x
+            if left is not None:
+                # 每行合并成一个脏矩形
+                dirty.append(self.cell_rect(left, y).union(self.cell_rect(right, y)))
+        self.piece_rows = piece_rows
+        if batch:
+            self.scene.blits(batch, doreturn=False)
+        return dirty
+
+    def _draw_score(self, score):
+        if score == self.score:
+            return []
+        self.score = score
+        old_rect = self.score_rect
+        self.scene.blit(self.static, old_rect, old_rect)
+        try:
+            text = self.font.render(f'{self.score_label}: {score}', True, WHITE)
+            self.score_rect = text.get_rect(left=self.score_pos[0], top=self.score_pos[1])
+            self.scene.blit(text, self.score_rect)
+        except Exception as e:
+            print(f"渲染文字时出错: {str(e)}")
+        return [old_rect.union(self.score_rect)]
+
+    def _draw_preview(self, block):
+        key = (block.shape_idx, block.rotation)
+        if key == self.preview:
+            return []
+        self.preview = key
+        self.scene.blit(self.static, self.preview_rect, self.preview_rect)
+        preview_x, preview_y = self.preview_pos
+        tile = self.tiles[block.color]
+        self.scene.blits([(tile, (preview_x + x * self.block_size, preview_y + y * self.block_size))
+                          for y, row in enumerate(block.shape)
+                          for x, filled in enumerate(row) if filled], doreturn=False)
+        return [self.preview_rect]
@@ -0,0 +1,125 @@
+import struct
+
+from .core import GameCore, Action, SOFT_DROP_FACTOR
+from .pieces import PieceGenerator
+
+# 回放文件格式（小端）：
+#   头部  : 魔数 b'TRPL'，版本号 (B)，生成模式 (B)，宽 (I)，高 (I)，随机种子 (Q)，加速下落倍数 (d)
+#   事件流: 每个事件为两个 varint —— 距上一事件的毫秒数、动作编号
+# 文件以一个 Action.NONE 事件结束，标记这一局的总时长
+MAGIC = b'TRPL'
+VERSION = 1
+_HEADER = struct.Struct('<4sBBIIQd')
+_MODES = (PieceGenerator.UNIFORM, PieceGenerator.BAG)
+
+def write_varint(buf, value):
+    """把非负整数以 LEB128 varint 追加到 bytearray 中"""
+    while value >= 0x80:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+def read_varint(data, pos):
+    """从 pos 读取一个 varint，返回 (值, 新位置)"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+class Recorder:
+    """记录一局游戏的随机种子和带时间戳的输入事件"""
+    def __init__(self, seed, mode=PieceGenerator.UNIFORM, width=10, height=20,
+                 soft_drop_factor=SOFT_DROP_FACTOR):
+        self.seed = seed
+        self.mode = mode
+        self.width = width
+        self.height = height
+        # 加速下落倍数可以由玩家设置，会影响下落时机，必须随回放保存
+        self.soft_drop_factor = soft_drop_factor
+        self.events = bytearray()
+        self.last_ms = 0
+
+    @classmethod
+    def attach(cls, core):
+        """为一局新游戏创建记录器并挂到 GameCore 上"""
+        recorder = cls(core.generator.seed, core.generator.mode, core.width, core.height,
+                       core.soft_drop_factor)
+        core.recorder = recorder
+        return recorder
+
+    def record(self, action, time):
+        """记录在游戏时间 time（秒）时发生的动作"""
+        time_ms = int(round(time * 1000))
+        write_varint(self.events, time_ms - self.last_ms)
+        write_varint(self.events, action)
+        self.last_ms = time_ms
+
+    def finish(self, time):
+        """以一个空动作标记这一局的结束时间"""
+        self.record(Action.NONE, time)
+
+    def to_bytes(self):
+        header = _HEADER.pack(MAGIC, VERSION, _MODES.index(self.mode),
+                              self.width, self.height, self.seed, self.soft_drop_factor)
+        return header + bytes(self.events)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.to_bytes())
+
+class Replay:
+    """解析回放数据并在无界面环境下重新模拟"""
+    def __init__(self, seed, mode, width, height, events, soft_drop_factor=SOFT_DROP_FACTOR):
+        self.seed = seed
+        self.mode = mode
+        self.width = width
+        self.height = height
+        self.soft_drop_factor = soft_drop_factor
+        # [(毫秒时间戳, 动作), ...]
+        self.events = events
+
+    @classmethod
+    def from_bytes(cls, data):
+        magic, version, mode, width, height, seed, soft_drop_factor = _HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("不是有效的回放文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的回放版本: {version}")
+        events = []
+        time_ms = 0
+        pos = _HEADER.size
+        while pos < len(data):
+            delta, pos = read_varint(data, pos)
+            action, pos = read_varint(data, pos)
+            time_ms += delta
+            events.append((time_ms, action))
+        return cls(seed, _MODES[mode], width, height, events, soft_drop_factor)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def simulate(self, **kwargs):
+        """按记录的输入重新模拟整局游戏，返回最终的 GameCore
+
+        默认使用回放中记录的加速下落倍数，kwargs 中的同名参数优先。
+        """
+        kwargs.setdefault('soft_drop_factor', self.soft_drop_factor)
+        core = GameCore(self.width, self.height, PieceGenerator(self.seed, self.mode), **kwargs)
+        now_ms = 0
+        for time_ms, action in self.events:
+            if core.game_over:
+                break
+            # 重力只取决于经过的总时间，可以一次推进到下一个事件；
+            # 同一帧内的多个事件之间不推进时间
+            if time_ms > now_ms:
+                core.update((time_ms - now_ms) / 1000)
+                now_ms = time_ms
+            core.apply(action)
+        return core
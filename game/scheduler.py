@@ -0,0 +1,103 @@
+import time
+
+import pygame
+
+def now_ms():
+    """单调时钟的当前时刻（毫秒，带小数）"""
+    return time.perf_counter() * 1000
+
+class FrameScheduler:
+    """根据画面是否在变化调整帧率
+
+    游戏进行中或按钮动画未结束时按固定帧率运行；画面静止时阻塞在 pygame.event.wait 上，
+    直到有事件或超时，空闲时几乎不占用 CPU。游戏逻辑按固定的毫秒步长推进，
+    下落时机不受帧间隔抖动影响。
+
+    等待下一帧时逐个接收事件，并在事件到达时记录时间戳 event.time_ms，
+    主循环据此把同一帧内的输入与各个逻辑步按实际先后交错执行。
+    收到按键事件时立即结束等待，输入在这一帧就画出来，不必再等到下一个固定帧。
+    """
+    def __init__(self, fps=60, idle_timeout=1000, logic_step_ms=5, max_frame_ms=250, profiler=None):
+        # 可选的 FrameProfiler，只统计取事件的时间，不包括等待
+        self.profiler = profiler
+        self.fps = fps
+        self.idle_timeout = idle_timeout
+        self.logic_step_ms = logic_step_ms
+        # 单帧最多推进的时间，避免窗口被拖动等长时间卡顿后一次追赶太多步
+        self.max_frame_ms = max_frame_ms
+        self.frame_ms = 0
+        self.accumulator = 0
+        # 当前帧开始（上一次 next_frame 返回）的时刻
+        self.frame_time = now_ms()
+        # 下一帧的预定时刻；按固定间隔推进，等待误差不会逐帧累积
+        self.deadline = self.frame_time
+
+    def next_frame(self, active):
+        """等待下一帧并返回这一帧的事件列表
+
+        active 为 False 时阻塞等待事件，本帧的经过时间记为 0。
+        """
+        if active:
+            # 上一帧因按键提前结束时沿用原来的预定时刻；落后超过一帧时不再追赶，从现在开始重新计时
+            if self.deadline - self.frame_time < 1:
+                self.deadline = max(self.deadline + 1000 / self.fps, self.frame_time)
+            events = self._wait_until(self.deadline)
+            events.extend(self._poll())
+            now = now_ms()
+            self.frame_ms = min(now - self.frame_time, self.max_frame_ms)
+            self.frame_time = now
+            return events
+
+        event = pygame.event.wait(self.idle_timeout)
+        events = [] if event.type == pygame.NOEVENT else [self._stamp(event)]
+        events.extend(self._poll())
+        # 空闲等待的时间不计入下一帧
+        self.frame_ms = 0
+        self.frame_time = self.deadline = now_ms()
+        return events
+
+    def _stamp(self, event, time_ms=None):
+        event.time_ms = now_ms() if time_ms is None else time_ms
+        return event
+
+    def _wait_until(self, deadline):
+        """在 deadline 之前逐个等待事件，每个事件到达时立即记录时间戳；收到按键事件时提前返回"""
+        events = []
+        while True:
+            # wait 的超时以毫秒为单位且为 0 时表示一直等待，不足 1 毫秒的部分不再等待
+            remaining = int(deadline - now_ms())
+            if remaining <= 0:
+                return events
+            event = pygame.event.wait(remaining)
+            if event.type == pygame.NOEVENT:
+                # 超时可能比要求的略早返回，重新计算剩余时间
+                continue
+            events.append(self._stamp(event))
+            if event.type in (pygame.KEYDOWN, pygame.KEYUP):
+                return events
+
+    def _poll(self):
+        if self.profiler is not None:
+            self.profiler.start('events')
+        time_ms = now_ms()
+        events = [self._stamp(event, time_ms) for event in pygame.event.get()]
+        if self.profiler is not None:
+            self.profiler.stop()
+        return events
+
+    def logic_steps(self):
+        """返回这一帧需要执行的固定逻辑步数，不足一步的时间留到下一帧"""
+        self.accumulator += self.frame_ms
+        steps = int(self.accumulator // self.logic_step_ms)
+        self.accumulator -= steps * self.logic_step_ms
+        return steps
+
+    def logic_step_times(self):
+        """返回这一帧每个逻辑步结束时对应的时刻（毫秒），与事件的 time_ms 可以直接比较"""
+        start = self.frame_time - self.frame_ms - self.accumulator
+        return [start + (i + 1) * self.logic_step_ms for i in range(self.logic_steps())]
+
+    @property
+    def logic_step(self):
+        """每个逻辑步长对应的秒数"""
+        return self.logic_step_ms / 1000
@@ -0,0 +1,122 @@
+import random
+
+from .core import GameCore, Action
+from .pieces import PieceGenerator
+from .snapshot import CELL_CODES
+
+# 每秒推进的逻辑帧数
+TICK_RATE = 30
+
+def keyframe(core):
+    """一个玩家的完整画面，只在客户端加入或需要重新同步时发送"""
+    board = core.board
+    return {
+        'board': ''.join(str(CELL_CODES[color]) for row in board.board for color in row),
+        'piece': list(core.current_block.placement),
+        'next': core.next_block.shape_idx,
+        'score': board.score,
+        'lines': core.lines,
+        'over': core.game_over,
+    }
+
+class DeltaTracker:
+    """记录上一次发出的画面，只生成之后发生变化的部分
+
+    游戏板的行是不可变元组（写时复制），与上次发出的行是同一个对象时可以直接跳过，
+    只有真正被改动的行才需要逐格比较。
+    """
+    def __init__(self):
+        self.rows = None
+        self.piece = None
+        self.next = None
+        self.score = None
+        self.lines = None
+        self.over = None
+
+    def delta(self, core):
+        """返回自上次调用以来变化的格子、方块位置和分数，没有变化时返回 None"""
+        board = core.board
+        rows = board.board
+        update = {}
+
+        last = self.rows
+        if last is None:
+            last = [None] * board.height
+        cells = []
+        for y, row in enumerate(rows):
+            old = last[y]
+            if row is old:
+                continue
+            for x, color in enumerate(row):
+                if old is None or old[x] != color:
+                    cells.append((x, y, CELL_CODES[color]))
+        if cells:
+            update['cells'] = cells
+        self.rows = tuple(rows)
+
+        piece = core.current_block.placement
+        if piece != self.piece:
+            self.piece = update['piece'] = piece
+        for key, value in (('next', core.next_block.shape_idx), ('score', board.score),
+                           ('lines', core.lines), ('over', core.game_over)):
+            if value != getattr(self, key):
+                setattr(self, key, value)
+                update[key] = value
+        return update or None
+
+class GameSession:
+    """一场对局：若干玩家使用相同的随机种子，拿到相同的方块序列
+
+    玩家的输入先排队，在下一个逻辑帧统一处理；每帧把所有玩家的变化合并成一条消息。
+    """
+    def __init__(self, name, players=2, seed=None, tick_rate=TICK_RATE):
+        self.name = name
+        if seed is None:
+            seed = random.randrange(1 << 32)
+        self.seed = seed
+        self.cores = [GameCore(generator=PieceGenerator(self.seed)) for _ in range(players)]
+        self.inputs = [[] for _ in range(players)]
+        self.trackers = [DeltaTracker() for _ in range(players)]
+        # 以初始画面为基准，之后只发送变化
+        for tracker, core in zip(self.trackers, self.cores):
+            tracker.delta(core)
+        self.tick_rate = tick_rate
+        self.tick = 0
+
+    @property
+    def finished(self):
+        return all(core.game_over for core in self.cores)
+
+    def add_input(self, player, action):
+        """把玩家的动作排入下一帧；非法的动作编号会被忽略"""
+        if Action.NONE < action <= Action.HARD_DROP:
+            self.inputs[player].append(action)
+
+    def step(self):
+        """推进一个逻辑帧，返回这一帧的增量消息，没有任何变化时返回 None"""
+        self.tick += 1
+        dt = 1 / self.tick_rate
+        games = []
+        for player, core in enumerate(self.cores):
+            for action in self.inputs[player]:
+                core.apply(action)
+            self.inputs[player].clear()
+            if not core.game_over:
+                core.update(dt)
+            update = self.trackers[player].delta(core)
+            if update is not None:
+                update['player'] = player
+                games.append(update)
+        if not games:
+            return None
+        return {'type': 'tick', 'tick': self.tick, 'games': games}
+
+    def keyframe(self):
+        """当前所有玩家的完整画面"""
+        games = []
+        for player, core in enumerate(self.cores):
+            game = keyframe(core)
+            game['player'] = player
+            games.append(game)
+        return {'type': 'state', 'tick': self.tick, 'width': self.cores[0].width,
+                'height': self.cores[0].height, 'seed': self.seed, 'games': games}
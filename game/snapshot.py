@@ -0,0 +1,144 @@
+import os
+import struct
+
+from .block import Block
+from .board import column_tops
+from .colors import BLACK, BLOCK_COLORS
+from .core import GameCore
+from .pieces import PieceGenerator
+from .replay import Recorder
+
+# 存档文件格式（小端）：
+#   头部    : 魔数 b'TSNP'，版本号 (B)，生成模式 (B)，宽 (I)，高 (I)
+#   状态    : 随机种子、分数、方块数、行数、游戏时间、下落计时、下落间隔、加速下落倍数、加速下落、游戏结束、
+#             计分表、当前方块和下一个方块的 (类型, 旋转, x, y)
+#   格子    : 最高的已占用行 top (I)，之后是 top 到最底行的 宽 × (高 - top) 个字节，逐行存放，
+#             0 为空，其余为方块类型 + 1；top 以上全是空行，不写入文件
+#   随机数  : random.Random 的内部状态（版本号、625 个 32 位整数、gauss 缓存）和 7-bag 中剩余的方块
+#   回放    : 是否有记录器、最后一个事件的毫秒数、事件流长度和事件流，读档后可以继续记录回放
+MAGIC = b'TSNP'
+VERSION = 1
+_HEADER = struct.Struct('<4sBBII')
+_TOP = struct.Struct('<I')
+_STATE = struct.Struct('<QQIIddddBB5IBBiiBBii')
+_RNG = struct.Struct('<B625IBdB')
+_RECORDER = struct.Struct('<BQI')
+_MODES = (PieceGenerator.UNIFORM, PieceGenerator.BAG)
+
+# 格子编码与颜色的对应关系
+PALETTE = [BLACK] + list(BLOCK_COLORS)
+CELL_CODES = {color: code for code, color in enumerate(PALETTE)}
+
+def to_bytes(core):
+    """把一局游戏序列化为紧凑的二进制存档"""
+    board = core.board
+    generator = core.generator
+    current, following = core.current_block, core.next_block
+    data = bytearray(_HEADER.pack(MAGIC, VERSION, _MODES.index(generator.mode),
+                                  core.width, core.height))
+    data += _STATE.pack(generator.seed, board.score, core.pieces, core.lines,
+                        core.elapsed, core.fall_time, core.normal_fall_speed,
+                        core.soft_drop_factor, core.soft_drop, core.game_over, *core.line_scores,
+                        *current.placement, *following.placement)
+    top = min(board.tops)
+    data += _TOP.pack(top)
+    # 空行共用同一个元组，直接写入全零；其余每个不同的行对象只编码一次
+    empty_row = board.empty_row
+    encoded = {id(empty_row): bytes(core.width)}
+    encode = CELL_CODES.__getitem__
+    try:
+        for row in board.board[top:]:
+            cells = encoded.get(id(row))
+            if cells is None:
+                cells = encoded[id(row)] = bytes(map(encode, row))
+            data += cells
+    except KeyError as e:
+        raise ValueError(f"无法保存的格子颜色: {e.args[0]}")
+
+    (version, words, gauss), bag = generator.getstate()
+    data += _RNG.pack(version, *words, gauss is not None, gauss or 0.0, len(bag))
+    data += bytes(bag)
+
+    recorder = core.recorder
+    if recorder is None:
+        data += _RECORDER.pack(0, 0, 0)
+    else:
+        data += _RECORDER.pack(1, recorder.last_ms, len(recorder.events))
+        data += recorder.events
+    return bytes(data)
+
+def from_bytes(data):
+    """从二进制存档恢复一局游戏，返回新的 GameCore"""
+    view = memoryview(data)
+    magic, version, mode, width, height = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("不是有效的存档文件")
+    if version != VERSION:
+        raise ValueError(f"不支持的存档版本: {version}")
+    pos = _HEADER.size
+    state = _STATE.unpack_from(view, pos)
+    pos += _STATE.size
+    (seed, score, pieces, lines, elapsed, fall_time, fall_speed, soft_drop_factor,
+     soft_drop, game_over) = state[:10]
+    line_scores = state[10:15]
+    current_state, next_state = state[15:19], state[19:23]
+
+    generator = PieceGenerator(seed, _MODES[mode])
+    core = GameCore(width, height, generator, fall_speed, line_scores, soft_drop_factor)
+
+    top, = _TOP.unpack_from(view, pos)
+    pos += _TOP.size
+    # 格子数据直接在读入的缓冲区上按行切片，不做额外复制
+    size = width * (height - top)
+    cells = view[pos:pos + size]
+    pos += size
+    board = core.board
+    for y in range(top, height):
+        row = cells[(y - top) * width:(y - top + 1) * width]
+        mask = 0
+        for x, code in enumerate(row):
+            if code:
+                mask |= 1 << x
+        board.rows[y] = mask
+        if mask:
+            board.board[y] = tuple([PALETTE[code] for code in row])
+    board.tops = column_tops(board.rows, width, top)
+    board.score = score
+
+    rng = _RNG.unpack_from(view, pos)
+    pos += _RNG.size
+    bag_len = rng[-1]
+    bag = tuple(view[pos:pos + bag_len])
+    pos += bag_len
+    gauss = rng[627] if rng[626] else None
+    generator.setstate(((rng[0], rng[1:626], gauss), bag))
+
+    has_recorder, last_ms, events_len = _RECORDER.unpack_from(view, pos)
+    pos += _RECORDER.size
+    if has_recorder:
+        recorder = Recorder.attach(core)
+        recorder.events = bytearray(view[pos:pos + events_len])
+        recorder.last_ms = last_ms
+
+    core.current_block = Block.from_placement(current_state)
+    core.next_block = Block.from_placement(next_state)
+    core.pieces = pieces
+    core.lines = lines
+    core.elapsed = elapsed
+    core.fall_time = fall_time
+    core.soft_drop = bool(soft_drop)
+    core.game_over = bool(game_over)
+    return core
+
+def save(core, path):
+    """一次写入整个存档；先写临时文件再替换，中途退出不会损坏旧存档"""
+    data = to_bytes(core)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def load(path):
+    """一次读入整个存档并恢复游戏"""
+    with open(path, 'rb') as f:
+        return from_bytes(f.read())
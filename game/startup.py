@@ -0,0 +1,25 @@
+import time
+
+class StartupTimer:
+    """记录启动到第一帧画面之间各阶段的耗时"""
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, name):
+        """结束一个阶段，记录自上一阶段结束以来的耗时"""
+        now = time.perf_counter()
+        self.phases.append((name, now - self.last))
+        self.last = now
+
+    @property
+    def total(self):
+        return self.last - self.start
+
+    def report(self):
+        lines = ["启动耗时:"]
+        for name, seconds in self.phases:
+            lines.append(f"  {seconds * 1000:8.1f} 毫秒  {name}")
+        lines.append(f"  {self.total * 1000:8.1f} 毫秒  首帧总计")
+        return '\n'.join(lines)
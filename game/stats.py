@@ -0,0 +1,8 @@
+import math
+
+def percentile(values, pct):
+    """最近秩法求百分位数，values 需已排序，为空时返回 0"""
+    if not values:
+        return 0
+    rank = max(0, math.ceil(pct / 100 * len(values)) - 1)
+    return values[rank]
@@ -0,0 +1,30 @@
+from collections import OrderedDict
+
+class SurfaceCache:
+    """带 LRU 淘汰的 Surface 缓存，用于静态文字和背景"""
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, key, factory):
+        """返回 key 对应的 Surface，不存在时调用 factory() 生成并缓存"""
+        surface = self.entries.get(key)
+        if surface is None:
+            surface = factory()
+            self.entries[key] = surface
+            if len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return surface
+
+    def render(self, font, text, color, antialias=True):
+        """缓存版的 font.render"""
+        return self.get((font, text, tuple(color), antialias),
+                        lambda: font.render(text, antialias, color))
+
+    def clear(self):
+        self.entries.clear()
+
+# 全局共享的缓存实例
+surface_cache = SurfaceCache()
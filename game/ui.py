@@ -0,0 +1,105 @@
+import pygame
+
+# 空间索引的网格大小（像素）
+GRID_SIZE = 64
+
+class UIDispatcher:
+    """按界面状态注册按钮，集中处理鼠标事件
+
+    每个状态的按钮按所在网格建立索引，指针事件只需查一次网格、检测格内的少数按钮。
+    同一帧内连续的 MOUSEMOTION 只记录最后的位置，在 flush 或下一个按键事件时才更新悬停状态。
+    按钮之间不应重叠。
+    """
+    def __init__(self):
+        # 状态 -> (按钮及其位置的签名, 网格索引)
+        self.layouts = {}
+        self.state = None
+        self.pointer = None
+        # 指针移动后尚未更新悬停状态
+        self.moved = False
+        self.hovered = None
+        self.pressed = None
+
+    def register(self, state, buttons):
+        """设置某个状态下显示的按钮；按钮和位置都没有变化时不重建索引"""
+        signature = tuple((button, tuple(button.rect)) for button in buttons)
+        layout = self.layouts.get(state)
+        if layout is not None and layout[0] == signature:
+            return
+        grid = {}
+        for button in buttons:
+            rect = button.rect
+            for gx in range(rect.left // GRID_SIZE, (rect.right - 1) // GRID_SIZE + 1):
+                for gy in range(rect.top // GRID_SIZE, (rect.bottom - 1) // GRID_SIZE + 1):
+                    grid.setdefault((gx, gy), []).append(button)
+        self.layouts[state] = (signature, grid)
+        if state == self.state and self.pointer is not None:
+            # 按钮移动后重新判断指针下的按钮
+            self._set_hovered(self.hit_test(state, self.pointer))
+
+    def hit_test(self, state, pos):
+        """返回 pos 处的按钮，没有时返回 None"""
+        layout = self.layouts.get(state)
+        if layout is None:
+            return None
+        x, y = pos
+        for button in layout[1].get((x // GRID_SIZE, y // GRID_SIZE), ()):
+            if button.rect.collidepoint(pos):
+                return button
+        return None
+
+    def handle_event(self, state, event):
+        """处理一个事件，鼠标左键在按钮上按下并松开时返回该按钮，否则返回 None"""
+        if event.type == pygame.MOUSEMOTION:
+            self.pointer = event.pos
+            self.moved = True
+            return None
+        if event.type not in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP) or event.button != 1:
+            return None
+
+        self.pointer = event.pos
+        self.moved = True
+        self.flush(state)
+        button = self.hovered
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            # 不要立即触发，等待鼠标抬起
+            if button is not None:
+                button.is_pressed = True
+                self.pressed = button
+            return None
+
+        pressed = self.pressed
+        self.pressed = None
+        if pressed is None:
+            return None
+        pressed.is_pressed = False
+        # 只有在按钮被按下并且鼠标仍在按钮上时才触发
+        return pressed if pressed is button else None
+
+    def flush(self, state):
+        """根据最后的指针位置更新悬停状态，每帧处理完事件后调用"""
+        if state != self.state:
+            # 切换界面时清除上一个界面按钮的状态
+            self._set_hovered(None)
+            self.state = state
+            self.moved = True
+        if not self.moved:
+            return
+        self.moved = False
+        if self.pointer is None:
+            self.pointer = pygame.mouse.get_pos()
+        self._set_hovered(self.hit_test(state, self.pointer))
+
+    def _set_hovered(self, button):
+        old = self.hovered
+        if button is old:
+            return
+        if old is not None:
+            old.is_hovered = False
+        if self.pressed is not None and self.pressed is not button:
+            # 指针离开按下的按钮时取消按下
+            self.pressed.is_pressed = False
+            self.pressed = None
+        if button is not None:
+            button.is_hovered = True
+        self.hovered = button
@@ -7,8 +7,8 @@ TEXT_COLOR = (255, 255, 255)  # White
 BUTTON_WIDTH = 200
 BUTTON_HEIGHT = 50
 TITLE_Y = 80  # Title Y position
-RULES_START_Y = 180  # Rules start Y position
-RULES_LINE_HEIGHT = 35  # Rules line height
+RULES_START_Y = 140  # Rules start Y position
+RULES_LINE_HEIGHT = 28  # Rules line height
 RULES_LEFT_MARGIN = 300  # Rules text left margin
 
 # Game text
@@ -21,6 +21,7 @@ QUIT_BUTTON_TEXT = "退出"
 NEXT_BLOCK_TEXT = "下一个"
 SCORE_TEXT = "分数"
 GAME_OVER_TEXT = "游戏结束"
+TRAINING_TEXT = "训练模式  Z: 后退  X: 前进"
 
 # Game rules text
 GAME_RULES = [
@@ -29,7 +30,9 @@ GAME_RULES = [
     "↑ : 旋转",
     "↓ : 加速下落",
     "空格 : 直接落下",
-    "ESC : 暂停"
+    "ESC : 暂停",
+    "A : 自动游戏",
+    "T : 训练模式（Z 后退，X 前进）"
 ] 
 
 # 按钮位置
@@ -1,15 +1,8 @@
-from kivy.app import App
-from kivy.uix.widget import Widget
-from tetris import main as tetris_main
-
-class TetrisGame(Widget):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        tetris_main()
-
-class TetrisApp(App):
-    def build(self):
-        return TetrisGame()
+def run():
+    """启动游戏；pygame 直接创建唯一的游戏窗口，不再经过 Kivy"""
+    # 推迟导入 tetris，需要时才加载 pygame
+    from tetris import main as tetris_main
+    tetris_main()
 
 if __name__ == '__main__':
-    TetrisApp().run() 
\ No newline at end of file
+    run()
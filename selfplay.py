@@ -0,0 +1,149 @@
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from game.ai import PlacementAI, plan_actions
+from game.board import LINE_SCORES
+from game.core import GameCore, Action, NORMAL_FALL_SPEED
+from game.pieces import PieceGenerator
+from game.stats import percentile
+
+# 与 tetris.main 的自动游戏一致：每帧 1/60 秒，执行一个动作
+FRAME_TIME = 1 / 60
+
+FIELDS = ['game', 'seed', 'score', 'lines', 'pieces', 'duration', 'pieces_per_second',
+          'wall_time', 'finished']
+
+def play_game(game_id, seed, weights=None, line_scores=LINE_SCORES,
+              fall_speed=NORMAL_FALL_SPEED, max_pieces=500, lookahead=True,
+              mode=PieceGenerator.UNIFORM):
+    """用 AI 在无界面环境下完整玩一局，返回这一局的统计数据"""
+    core = GameCore(generator=PieceGenerator(seed, mode),
+                    fall_speed=fall_speed, line_scores=line_scores)
+    ai = PlacementAI(weights)
+    frames = 0
+    planned_block = None
+    planned_actions = []
+    start = time.perf_counter()
+    while not core.game_over and core.pieces < max_pieces:
+        if planned_block is not core.current_block:
+            planned_block = core.current_block
+            move = ai.best_move(core.board, core.current_block,
+                                core.next_block if lookahead else None)
+            planned_actions = plan_actions(core.current_block, move) if move else []
+        action = planned_actions.pop(0) if planned_actions else Action.NONE
+        core.step(action, FRAME_TIME)
+        frames += 1
+    duration = frames * FRAME_TIME
+    return {
+        'game': game_id,
+        'seed': seed,
+        'score': core.score,
+        'lines': core.lines,
+        'pieces': core.pieces,
+        'duration': round(duration, 3),
+        'pieces_per_second': round(core.pieces / duration, 3) if duration else 0.0,
+        'wall_time': round(time.perf_counter() - start, 4),
+        'finished': core.game_over,
+    }
+
+def summarize(results):
+    """汇总多局的得分分布、每局行数、每秒方块数和游戏时长"""
+    summary = {'games': len(results)}
+    for field in ('score', 'lines', 'pieces', 'duration', 'pieces_per_second'):
+        values = sorted(r[field] for r in results)
+        summary[field] = {
+            'mean': round(sum(values) / len(values), 3) if values else 0,
+            'min': values[0] if values else 0,
+            'p25': percentile(values, 25),
+            'p50': percentile(values, 50),
+            'p75': percentile(values, 75),
+            'p90': percentile(values, 90),
+            'max': values[-1] if values else 0,
+        }
+    return summary
+
+class _ResultWriter:
+    """每完成一局就写入一行，JSONL 或 CSV 由文件扩展名决定"""
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.csv = None
+        if path.endswith('.csv'):
+            self.csv = csv.DictWriter(self.file, fieldnames=FIELDS)
+            self.csv.writeheader()
+
+    def write(self, result):
+        if self.csv:
+            self.csv.writerow(result)
+        else:
+            self.file.write(json.dumps(result, ensure_ascii=False) + '\n')
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+def _non_negative_int(value):
+    """--line-scores 的参数类型：非负整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是整数: {value}")
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"不能为负数: {value}")
+    return number
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='多进程无界面自对弈，用于调试 AI 权重和游戏平衡参数')
+    parser.add_argument('-n', '--games', type=int, default=1000, help='对局数')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count(), help='进程数')
+    parser.add_argument('--seed', type=int, default=0, help='第 i 局使用 seed + i 作为随机种子')
+    parser.add_argument('--bag', action='store_true', help='使用 7-bag 方块序列')
+    parser.add_argument('--max-pieces', type=int, default=500, help='每局最多放置的方块数')
+    parser.add_argument('--no-lookahead', action='store_true', help='AI 不考虑下一个方块')
+    parser.add_argument('--weights', type=json.loads, default=None,
+                        help='AI 启发式权重（JSON），例如 \'{"holes": -0.5}\'')
+    parser.add_argument('--line-scores', nargs=4, type=_non_negative_int, default=None,
+                        metavar='SCORE', help='消除 1~4 行的得分，例如 --line-scores 100 300 500 800')
+    parser.add_argument('--fall-speed', type=float, default=NORMAL_FALL_SPEED, help='下落间隔（秒）')
+    parser.add_argument('-o', '--output', default='selfplay.jsonl',
+                        help='逐局结果输出文件（.jsonl 或 .csv）')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    line_scores = LINE_SCORES
+    if args.line_scores:
+        line_scores = (0,) + tuple(args.line_scores)
+
+    print(f"开始自对弈: {args.games} 局, {args.workers} 个进程")
+    writer = _ResultWriter(args.output)
+    results = []
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = [pool.submit(play_game, i, args.seed + i, args.weights, line_scores,
+                                   args.fall_speed, args.max_pieces, not args.no_lookahead,
+                                   PieceGenerator.BAG if args.bag else PieceGenerator.UNIFORM)
+                       for i in range(args.games)]
+            for future in as_completed(futures):
+                result = future.result()
+                writer.write(result)
+                results.append(result)
+                if len(results) % 100 == 0:
+                    print(f"已完成 {len(results)}/{args.games} 局")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    summary = summarize(results)
+    summary['wall_time'] = round(elapsed, 3)
+    summary['games_per_second'] = round(len(results) / elapsed, 3) if elapsed else 0.0
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    print(f"逐局结果已写入: {args.output}")
+    return summary
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+import argparse
+import asyncio
+import json
+
+from game.session import GameSession, TICK_RATE
+
+# 协议：每条消息是一行 JSON（UTF-8，以换行结尾）
+#   客户端 -> 服务器
+#     {"type": "join", "session": "名称", "role": "player" | "spectator"}  必须是第一条消息
+#     {"type": "input", "action": 动作编号}                                 见 game.core.Action
+#   服务器 -> 客户端
+#     {"type": "welcome", "session": ..., "player": 玩家编号或 null}
+#     {"type": "state", ...}   完整画面，加入时以及跟不上进度、需要重新同步时发送
+#     {"type": "tick", ...}    每个逻辑帧一条，只包含变化的格子、方块位置和分数
+#     {"type": "error", "message": ...}
+
+# 每个客户端最多积压的消息数，超过后丢弃积压并在追上时重新同步完整画面
+DEFAULT_QUEUE_SIZE = 64
+# 套接字写缓冲区上限，超过后 drain() 会等待，积压体现在消息队列上
+WRITE_BUFFER_LIMIT = 64 * 1024
+
+# 队列中的特殊标记：发送当前的完整画面
+RESYNC = None
+
+def encode(message):
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+
+class Client:
+    """一个连接：带上限的发送队列和单独的写任务"""
+    def __init__(self, writer, session, player, queue_size):
+        self.writer = writer
+        self.session = session
+        self.player = player
+        self.queue = asyncio.Queue(queue_size)
+        # 等待重新同步期间不再排入增量
+        self.resync = True
+        self.queue.put_nowait(RESYNC)
+        self.resyncs = 0
+
+    def send(self, data):
+        """排入一条已编码的消息；队列已满说明客户端跟不上，改为重新同步"""
+        if self.resync:
+            return
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resync = True
+            self.resyncs += 1
+            self.queue.put_nowait(RESYNC)
+
+    async def write_loop(self):
+        try:
+            while True:
+                data = await self.queue.get()
+                if data is RESYNC:
+                    # 完整画面在真正发送时才生成，之后的增量都以它为基准
+                    data = encode(self.session.keyframe())
+                    self.resync = False
+                self.writer.write(data)
+                await self.writer.drain()
+        except ConnectionError:
+            # 对方已断开，读循环会收到 EOF 并负责清理
+            pass
+
+class GameServer:
+    """在一个事件循环中托管多场对局，每场对局一个定时推进的任务"""
+    def __init__(self, players=2, tick_rate=TICK_RATE, queue_size=DEFAULT_QUEUE_SIZE, seed=None):
+        self.players = players
+        self.tick_rate = tick_rate
+        self.queue_size = queue_size
+        self.seed = seed
+        # 名称 -> [GameSession, 客户端集合, 空闲的玩家编号, 推进任务]
+        # 推进任务在所有玩家位置都坐满后才启动，之前为 None
+        self.sessions = {}
+
+    def _get_session(self, name):
+        entry = self.sessions.get(name)
+        if entry is None:
+            session = GameSession(name, self.players, self.seed, self.tick_rate)
+            entry = [session, set(), list(range(self.players)), None]
+            self.sessions[name] = entry
+        return entry
+
+    def _start_session(self, entry):
+        """玩家到齐后开始计时推进；之后有人离开也不会暂停"""
+        if entry[3] is None:
+            entry[3] = asyncio.ensure_future(self._run_session(entry))
+
+    async def _run_session(self, entry):
+        session, clients = entry[0], entry[1]
+        loop = asyncio.get_running_loop()
+        interval = 1 / session.tick_rate
+        next_time = loop.time()
+        while not session.finished:
+            next_time += interval
+            await asyncio.sleep(max(0.0, next_time - loop.time()))
+            message = session.step()
+            if message is not None:
+                # 每帧只编码一次，所有客户端共享同一份数据
+                data = encode(message)
+                for client in clients:
+                    client.send(data)
+        # 已结束的对局不再接受加入，同名的新连接会开始新的一局；
+        # 仍连着的客户端保留最后的画面直到断开
+        if self.sessions.get(session.name) is entry:
+            del self.sessions[session.name]
+
+    async def handle_client(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+        client = None
+        entry = None
+        writer_task = None
+        try:
+            try:
+                hello = json.loads(await reader.readline())
+                name = str(hello['session'])
+                role = hello.get('role', 'spectator')
+            except (ValueError, KeyError, TypeError):
+                writer.write(encode({'type': 'error', 'message': '第一条消息必须是 join'}))
+                return
+
+            entry = self._get_session(name)
+            session, clients, free_players = entry[0], entry[1], entry[2]
+            player = None
+            if role == 'player':
+                if not free_players:
+                    writer.write(encode({'type': 'error', 'message': '对局已满'}))
+                    return
+                player = free_players.pop(0)
+            writer.write(encode({'type': 'welcome', 'session': name, 'player': player}))
+
+            client = Client(writer, session, player, self.queue_size)
+            clients.add(client)
+            writer_task = asyncio.ensure_future(client.write_loop())
+            if not free_players:
+                self._start_session(entry)
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if player is None:
+                    continue
+                try:
+                    message = json.loads(line)
+                    if message.get('type') == 'input':
+                        session.add_input(player, int(message['action']))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if writer_task is not None:
+                writer_task.cancel()
+            if client is not None:
+                self._leave(entry, client)
+            writer.close()
+
+    def _leave(self, entry, client):
+        session, clients, free_players, task = entry
+        clients.discard(client)
+        if client.player is not None:
+            free_players.append(client.player)
+            free_players.sort()
+        if not clients:
+            # 没有客户端的对局直接结束
+            if task is not None:
+                task.cancel()
+            if self.sessions.get(session.name) is entry:
+                del self.sessions[session.name]
+
+    async def serve(self, host, port):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"服务器已启动: {host}:{port}，每局 {self.players} 名玩家，每秒 {self.tick_rate} 帧")
+        async with server:
+            await server.serve_forever()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='多人对战和观战服务器（TCP，每行一条 JSON 消息）')
+    parser.add_argument('--host', default='127.0.0.1', help='监听地址')
+    parser.add_argument('--port', type=int, default=7777, help='监听端口')
+    parser.add_argument('--players', type=int, default=2, help='每局的玩家数')
+    parser.add_argument('--tick-rate', type=int, default=TICK_RATE, help='每秒推进的逻辑帧数')
+    parser.add_argument('--queue-size', type=int, default=DEFAULT_QUEUE_SIZE,
+                        help='每个客户端最多积压的消息数，超过后重新同步')
+    parser.add_argument('--seed', type=int, default=None, help='固定所有对局的随机种子')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    server = GameServer(args.players, args.tick_rate, args.queue_size, args.seed)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == '__main__':
+    main()
@@ -1,89 +1,127 @@
 # -*- coding: utf-8 -*-
 
+from game.startup import StartupTimer
+# 从导入模块开始计时，用于启动耗时报告
+startup = StartupTimer()
+
 import pygame
 import sys
 import os
 import math
-from game.colors import BLACK, WHITE, GRAY, BACKGROUND, LIGHT_BG, TEXT_PRIMARY, TEXT_SECONDARY, NEUTRAL
-from game.block import Block
-from game.board import Board
+import struct
+import time
+from game.colors import WHITE, BACKGROUND, LIGHT_BG, TEXT_PRIMARY, TEXT_SECONDARY, NEUTRAL
+from game.core import GameCore, Action, SOFT_DROP_FACTOR
+from game.ai import PlacementAI, plan_actions
+from game.replay import Recorder
+from game import snapshot
+from game.history import History
+from game.renderer import BoardRenderer
+from game.surface_cache import surface_cache
+from game.fonts import get_font
+from game.scheduler import FrameScheduler, now_ms
+from game.input import InputEngine, DAS_MS, ARR_MS
+from game.profiler import FrameProfiler
 from game.button import Button
+from game.ui import UIDispatcher
 from game.ui_constants import *
 
-# 初始化 Pygame
-pygame.init()
-
 # 游戏常量
 BLOCK_SIZE = 30
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
-BOARD_WIDTH = 10
-BOARD_HEIGHT = 20
-
-# 计算游戏板的位置使其居中
-BOARD_OFFSET_X = (SCREEN_WIDTH - BOARD_WIDTH * BLOCK_SIZE) // 2
-BOARD_OFFSET_Y = (SCREEN_HEIGHT - BOARD_HEIGHT * BLOCK_SIZE) // 2
-
-# 创建游戏窗口
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption('TETRIS')
-
-# 设置中文字体
-def get_font(size):
-    # macOS 系统常用中文字体
-    system_fonts = [
-        'PingFang SC',        # 苹方
-        'STHeiti',            # 华文黑体
-        'Heiti TC',           # 黑体-繁
-        'Hiragino Sans GB',   # 冬青黑体
-        'Apple LiGothic',     # 苹果丽黑
-    ]
-    
-    # 获取系统可用字体列表
-    available_fonts = pygame.font.get_fonts()
-    print(f"系统可用字体: {available_fonts}")
-    
-    # 尝试加载系统字体
-    for font_name in system_fonts:
+# 屏幕上显示的游戏板区域最多这么多格，更大的游戏板只显示跟随当前方块滚动的一块
+VIEW_WIDTH = 10
+VIEW_HEIGHT = 20
+# 游戏结束时保存回放的目录
+REPLAY_DIR = 'replays'
+# 暂停、返回菜单、退出时以及游戏中每隔 AUTOSAVE_INTERVAL 秒写入的存档
+SAVE_PATH = 'savegame.tsn'
+AUTOSAVE_INTERVAL = 5.0
+# 训练模式最多可以后退的步数（每个落定的方块一步）
+TRAINING_HISTORY_DEPTH = 10000
+# 训练模式的每条记录保存游戏板每一行的引用，所有记录合计最多保存这么多行，很高的游戏板上步数相应减少
+TRAINING_HISTORY_ROWS = 2000000
+# 自动游戏规划一个方块的耗时随游戏板增大而迅速增加，格子数超过这个值时不能开启
+AUTOPLAY_MAX_CELLS = 1000
+
+def _board_size():
+    """环境变量 TETRIS_BOARD 或 --board=宽x高 指定游戏板大小（例如 1000x100000），默认 10x20"""
+    value = os.environ.get('TETRIS_BOARD')
+    for arg in sys.argv[1:]:
+        if arg.startswith('--board='):
+            value = arg.split('=', 1)[1]
+    if value:
         try:
-            # 转换字体名称为小写并去除空格，以匹系统字体列表格式
-            font_key = font_name.lower().replace(' ', '')
-            if font_key in available_fonts:
-                font = pygame.font.SysFont(font_name, size)
-                # 测试字体是否能渲染中文
-                test_surface = font.render('测试', True, (255, 255, 255))
-                print(f"成功加载字体: {font_name}")
-                return font
-        except Exception as e:
-            print(f"加载字体 {font_name} 失败: {str(e)}")
-            continue
-    
-    # 如果系统字体都失败了，尝试从固定路径加载字体
-    mac_font_paths = [
-        '/System/Library/Fonts/PingFang.ttc',
-        '/System/Library/Fonts/STHeiti Light.ttc',
-        '/System/Library/Fonts/STHeiti Medium.ttc',
-        '/Library/Fonts/Arial Unicode.ttf'
-    ]
-    
-    for font_path in mac_font_paths:
+            width, height = (int(n) for n in value.lower().split('x'))
+            # 最长的方块（I）横放、竖放都要放得下
+            if width >= 4 and height >= 4:
+                return width, height
+        except ValueError:
+            pass
+        print(f"无效的游戏板大小: {value}，使用默认大小")
+    return 10, 20
+
+BOARD_WIDTH, BOARD_HEIGHT = _board_size()
+
+# 计算游戏板显示区域的位置使其居中
+VIEW_SIZE = (min(BOARD_WIDTH, VIEW_WIDTH), min(BOARD_HEIGHT, VIEW_HEIGHT))
+BOARD_OFFSET_X = (SCREEN_WIDTH - VIEW_SIZE[0] * BLOCK_SIZE) // 2
+BOARD_OFFSET_Y = (SCREEN_HEIGHT - VIEW_SIZE[1] * BLOCK_SIZE) // 2
+
+# 设置环境变量 TETRIS_STARTUP_REPORT 或传入 --startup-report 时输出启动耗时报告
+STARTUP_REPORT = bool(os.environ.get('TETRIS_STARTUP_REPORT')) or '--startup-report' in sys.argv
+
+def _profile_path():
+    """环境变量 TETRIS_PROFILE 或 --profile=文件 指定帧耗时统计的导出文件（.json 或 .csv）"""
+    for arg in sys.argv[1:]:
+        if arg.startswith('--profile='):
+            return arg.split('=', 1)[1]
+    return os.environ.get('TETRIS_PROFILE')
+
+# 指定导出文件时从启动开始统计每帧各阶段的耗时并在退出时导出；F3 随时显示或隐藏性能浮层
+PROFILE_PATH = _profile_path()
+
+def _positive_env(name, default, convert):
+    """读取为正数的环境变量，未设置时返回默认值；无法解析、不是正数或为无穷大时提示并使用默认值"""
+    value = os.environ.get(name)
+    if value:
         try:
-            if os.path.exists(font_path):
-                font = pygame.font.Font(font_path, size)
-                test_surface = font.render('测试', True, (255, 255, 255))
-                print(f"成功加载字体文件: {font_path}")
-                return font
-        except Exception as e:
-            print(f"加载字体文件 {font_path} 失败: {str(e)}")
-            continue
-    
-    print("警告: 无法载中文字体，将使用系统默认字体")
-    return pygame.font.Font(None, size)
-
-# 创建字体对
-font = get_font(36)
-title_font = get_font(72)
-rule_font = get_font(28)
+            number = convert(value)
+            if 0 < number < math.inf:
+                return number
+        except ValueError:
+            pass
+        print(f"无效的 {name}: {value}，使用默认值 {default}")
+    return default
+
+# 操作手感：左右键自动重复的延迟和间隔（毫秒）以及加速下落的倍数，
+# 可以用环境变量 TETRIS_DAS、TETRIS_ARR、TETRIS_SOFT_DROP 调整
+DAS = _positive_env('TETRIS_DAS', DAS_MS, int)
+ARR = _positive_env('TETRIS_ARR', ARR_MS, int)
+SOFT_DROP = _positive_env('TETRIS_SOFT_DROP', SOFT_DROP_FACTOR, float)
+
+# 游戏窗口在 main() 中才创建，导入本模块不会初始化 pygame
+screen = None
+
+def init_display():
+    """只初始化用到的 pygame 模块（显示和字体）并创建游戏窗口"""
+    global screen
+    if screen is None:
+        pygame.display.init()
+        pygame.font.init()
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        pygame.display.set_caption('TETRIS')
+    return screen
+
+# 游戏进行时按键与动作的对应关系
+KEY_ACTIONS = {
+    pygame.K_LEFT: Action.LEFT,
+    pygame.K_RIGHT: Action.RIGHT,
+    pygame.K_UP: Action.ROTATE,
+    pygame.K_DOWN: Action.SOFT_DROP,
+    pygame.K_SPACE: Action.HARD_DROP,
+}
 
 class GameState:
     MENU = "menu"
@@ -96,72 +134,165 @@ def _lerp_color(start_color, end_color, amount):
     return tuple(int(start + (end - start) * amount) 
                 for start, end in zip(start_color, end_color))
 
-def draw_menu(screen, buttons):
-    # 绘制渐变背景
+def _build_menu_background():
+    """生成菜单的静态背景：渐变、标题和游戏规则"""
+    background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+
+    # 渐变只取决于行号，先画一列再横向拉伸到整屏宽度
+    column = pygame.Surface((1, SCREEN_HEIGHT)).convert()
     for i in range(SCREEN_HEIGHT):
         # 计算当前位置的渐变颜色
         amount = i / SCREEN_HEIGHT
-        color = _lerp_color(BACKGROUND, LIGHT_BG, amount)
-        pygame.draw.line(screen, color, (0, i), (SCREEN_WIDTH, i))
+        column.set_at((0, i), _lerp_color(BACKGROUND, LIGHT_BG, amount))
+    pygame.transform.scale(column, (SCREEN_WIDTH, SCREEN_HEIGHT), background)
     
+    title_font = get_font(72)
+    rule_font = get_font(28)
     try:
         # 绘制标题
-        title_text = title_font.render(GAME_TITLE, True, TEXT_PRIMARY)
+        title_text = surface_cache.render(title_font, GAME_TITLE, TEXT_PRIMARY)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, TITLE_Y))
         
         # 添加标题阴影效果
-        shadow_surface = title_font.render(GAME_TITLE, True, NEUTRAL)
+        shadow_surface = surface_cache.render(title_font, GAME_TITLE, NEUTRAL)
         shadow_rect = title_rect.copy()
         shadow_rect.x += 2
         shadow_rect.y += 2
-        screen.blit(shadow_surface, shadow_rect)
-        screen.blit(title_text, title_rect)
+        background.blit(shadow_surface, shadow_rect)
+        background.blit(title_text, title_rect)
 
         # 绘制游戏规则
         for i, rule in enumerate(GAME_RULES):
-            rule_text = rule_font.render(rule, True, TEXT_SECONDARY)
+            rule_text = surface_cache.render(rule_font, rule, TEXT_SECONDARY)
             rule_rect = rule_text.get_rect(left=RULES_LEFT_MARGIN, 
                                          top=RULES_START_Y + i * RULES_LINE_HEIGHT)
-            screen.blit(rule_text, rule_rect)
+            background.blit(rule_text, rule_rect)
     except Exception as e:
         print(f"渲染文字时出错: {str(e)}")
+    return background
+
+def draw_menu(screen, buttons):
+    # 静态背景只生成一次，之后每帧只需一次 blit
+    screen.blit(surface_cache.get('menu_background', _build_menu_background), (0, 0))
 
     # 绘制按钮
     for button in buttons:
         button.draw(screen)
 
-def draw_game_board(screen, board, current_block, next_block, game_state):
-    # 绘制毛玻璃效果的背景
-    bg_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-    bg_surface.fill(BACKGROUND)
-    bg_surface.set_alpha(230)
-    screen.blit(bg_surface, (0, 0))
-
-    # 绘制游戏区域背景
-    board_bg_rect = pygame.Rect(BOARD_OFFSET_X - 10, BOARD_OFFSET_Y - 10,
-                               BOARD_WIDTH * BLOCK_SIZE + 20,
-                               BOARD_HEIGHT * BLOCK_SIZE + 20)
-    pygame.draw.rect(screen, LIGHT_BG, board_bg_rect, border_radius=15)
-    pygame.draw.rect(screen, NEUTRAL, board_bg_rect, 1, border_radius=15)
-
-    # 绘制网格线
-    for x in range(BOARD_WIDTH + 1):
-        pygame.draw.line(screen, NEUTRAL,
-                        (BOARD_OFFSET_X + x * BLOCK_SIZE, BOARD_OFFSET_Y),
-                        (BOARD_OFFSET_X + x * BLOCK_SIZE, BOARD_OFFSET_Y + BOARD_HEIGHT * BLOCK_SIZE))
-    for y in range(BOARD_HEIGHT + 1):
-        pygame.draw.line(screen, NEUTRAL,
-                        (BOARD_OFFSET_X, BOARD_OFFSET_Y + y * BLOCK_SIZE),
-                        (BOARD_OFFSET_X + BOARD_WIDTH * BLOCK_SIZE, BOARD_OFFSET_Y + y * BLOCK_SIZE))
-
-    # ... (其余绘制代码保持不变)
+def draw_profiler_overlay(screen, profiler, renderer=None):
+    """在左下角绘制性能浮层，返回它占用的区域"""
+    surface = profiler.overlay_surface(get_font(18))
+    rect = surface.get_rect(bottomleft=(10, SCREEN_HEIGHT - 10))
+    if renderer is not None:
+        # 浮层半透明，先恢复下方的游戏画面
+        renderer.restore(rect)
+    screen.blit(surface, rect)
+    return rect
+
+def new_game():
+    """创建一局新游戏并开始记录回放"""
+    core = GameCore(BOARD_WIDTH, BOARD_HEIGHT, soft_drop_factor=SOFT_DROP)
+    Recorder.attach(core)
+    return core
+
+def save_replay(core):
+    """把一局游戏的回放写入 REPLAY_DIR"""
+    # 训练模式下不记录回放
+    if core.recorder is None:
+        return
+    core.recorder.finish(core.elapsed)
+    path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{core.score}.trp")
+    try:
+        os.makedirs(REPLAY_DIR, exist_ok=True)
+        core.recorder.save(path)
+        print(f"回放已保存: {path}")
+    except (OSError, struct.error) as e:
+        print(f"保存回放失败: {str(e)}")
+
+def save_game(core):
+    """把当前游戏写入 SAVE_PATH，返回是否成功"""
+    try:
+        snapshot.save(core, SAVE_PATH)
+        return True
+    except (OSError, ValueError, struct.error) as e:
+        print(f"保存游戏失败: {str(e)}")
+        return False
+
+def pause_game(core):
+    """暂停游戏并存档，返回是否存档成功
+
+    暂停期间松开的按键不会传给游戏，这里先松开加速下落，恢复后不会一直加速，存档中也不会带上这个状态。
+    """
+    if core.soft_drop:
+        core.apply(Action.SOFT_DROP_RELEASE)
+    return save_game(core)
+
+def load_game():
+    """读取 SAVE_PATH 中的游戏，失败时返回 None"""
+    try:
+        core = snapshot.load(SAVE_PATH)
+        if (core.width, core.height) != (BOARD_WIDTH, BOARD_HEIGHT):
+            raise ValueError(f"存档的游戏板大小 {core.width}x{core.height} 与当前设置不同")
+        return core
+    except (OSError, ValueError, struct.error) as e:
+        print(f"读取存档失败: {str(e)}")
+        return None
+
+def delete_save():
+    """游戏结束后删除存档"""
+    try:
+        os.remove(SAVE_PATH)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"删除存档失败: {str(e)}")
+
+def toggle_training(core):
+    """开启或关闭训练模式；训练模式下可以后退、前进，回退后的游戏不再保存回放"""
+    if core.history is None:
+        History.attach(core, max(1, min(TRAINING_HISTORY_DEPTH, TRAINING_HISTORY_ROWS // core.height)))
+        core.recorder = None
+    else:
+        core.history = None
+
+def create_game_buttons(center_x):
+    """创建游戏界面和暂停、结束界面的按钮，第一次离开菜单时才需要"""
+    # 游戏界面的按钮
+    pause_button = Button(SCREEN_WIDTH - 140, 20, 120, 40, 
+                         PAUSE_BUTTON_TEXT, BUTTON_COLOR, BUTTON_HOVER_COLOR, 24)
+    
+    # 暂停菜单按钮
+    resume_button = Button(center_x, MENU_BUTTON_START_Y, BUTTON_WIDTH, BUTTON_HEIGHT,
+                          RESUME_BUTTON_TEXT, BUTTON_COLOR, BUTTON_HOVER_COLOR)
+    restart_button = Button(center_x, MENU_BUTTON_START_Y + MENU_BUTTON_GAP, BUTTON_WIDTH, BUTTON_HEIGHT,
+                          "重新开始", BUTTON_COLOR, BUTTON_HOVER_COLOR)
+    back_to_menu_button = Button(center_x, MENU_BUTTON_START_Y + MENU_BUTTON_GAP * 2, BUTTON_WIDTH, BUTTON_HEIGHT,
+                          "返回主菜单", BUTTON_COLOR, BUTTON_HOVER_COLOR)
+    return pause_button, resume_button, restart_button, back_to_menu_button
+
+def menu_buttons(start_button, continue_button, quit_button, has_saved_game):
+    """主菜单显示的按钮：有存档时显示三个按钮，退出按钮移到第三行"""
+    if has_saved_game:
+        quit_button.rect.y = MENU_BUTTON_START_Y + MENU_BUTTON_GAP * 2
+        return [start_button, continue_button, quit_button]
+    # 无存档时只显示两个按钮，退出按钮在第二行
+    quit_button.rect.y = MENU_BUTTON_START_Y + MENU_BUTTON_GAP
+    return [start_button, quit_button]
 
 def main():
+    screen = init_display()
+    startup.mark('初始化窗口')
+    font = get_font(36)
+    startup.mark('加载字体')
+
     # 创建游戏实例
-    board = Board(BOARD_WIDTH, BOARD_HEIGHT)
-    current_block = Block()
-    next_block = Block()
-    clock = pygame.time.Clock()
+    core = new_game()
+    # 帧耗时统计，默认关闭
+    profiler = FrameProfiler(enabled=bool(PROFILE_PATH))
+    # 帧调度：静止画面阻塞等待事件，游戏中按固定步长推进逻辑
+    scheduler = FrameScheduler(60, profiler=profiler)
+    # 游戏中的方向键、旋转和降落键由输入引擎按时间戳转换为动作
+    inputs = InputEngine(KEY_ACTIONS, DAS, ARR)
     
     # 创建按钮
     center_x = SCREEN_WIDTH // 2 - BUTTON_WIDTH // 2
@@ -173,32 +304,44 @@ def main():
                          "继续游戏", BUTTON_COLOR, BUTTON_HOVER_COLOR)
     quit_button = Button(center_x, MENU_BUTTON_START_Y + MENU_BUTTON_GAP, BUTTON_WIDTH, BUTTON_HEIGHT,
                         QUIT_BUTTON_TEXT, BUTTON_COLOR, BUTTON_HOVER_COLOR)
-    
-    # 游戏界面的按钮
-    pause_button = Button(SCREEN_WIDTH - 140, 20, 120, 40, 
-                         PAUSE_BUTTON_TEXT, BUTTON_COLOR, BUTTON_HOVER_COLOR, 24)
-    
-    # 暂停菜单按钮
-    resume_button = Button(center_x, MENU_BUTTON_START_Y, BUTTON_WIDTH, BUTTON_HEIGHT,
-                          RESUME_BUTTON_TEXT, BUTTON_COLOR, BUTTON_HOVER_COLOR)
-    restart_button = Button(center_x, MENU_BUTTON_START_Y + MENU_BUTTON_GAP, BUTTON_WIDTH, BUTTON_HEIGHT,
-                          "重新开始", BUTTON_COLOR, BUTTON_HOVER_COLOR)
-    back_to_menu_button = Button(center_x, MENU_BUTTON_START_Y + MENU_BUTTON_GAP * 2, BUTTON_WIDTH, BUTTON_HEIGHT,
-                          "返回主菜单", BUTTON_COLOR, BUTTON_HOVER_COLOR)
+    # 游戏界面的按钮按需创建
+    pause_button = resume_button = restart_button = back_to_menu_button = None
+    # 按界面状态分发鼠标事件
+    ui = UIDispatcher()
+    startup.mark('创建按钮')
 
     # 游戏状态
     game_state = GameState.MENU
-    fall_time = 0
-    fall_speed = 0.5
-    # 保存上一次的游戏状，用于继续游戏
-    saved_game_state = None
+    # 是否有可以继续的存档（上次退出时保存的游戏也可以继续）
+    has_saved_game = os.path.exists(SAVE_PATH)
+    # 第一帧的事件在绘制之前处理，菜单按钮需要提前注册
+    ui.register(GameState.MENU, menu_buttons(start_button, continue_button, quit_button,
+                                             has_saved_game))
+    # 自动游戏：AI 为每个新方块规划动作，每帧执行一步
+    ai = PlacementAI()
+    autoplay = False
+    planned_block = None
+    planned_actions = []
+
+    # 游戏画面的渲染器
+    renderer = BoardRenderer(screen, font, (BOARD_OFFSET_X, BOARD_OFFSET_Y), BLOCK_SIZE,
+                             preview_pos=(SCREEN_WIDTH - 120, 120),
+                             next_label=NEXT_BLOCK_TEXT, next_label_pos=(SCREEN_WIDTH - 150, 80),
+                             score_label=SCORE_TEXT, score_pos=(20, 20), profiler=profiler,
+                             view_size=VIEW_SIZE)
+    drawn_state = None
+    # 上一帧显示的按钮是否还在播放颜色过渡动画
+    animating = True
 
     # 游戏主循环
     running = True
     while running:
-        dt = clock.tick(60) / 1000.0
+        # 只有游戏进行中或按钮动画未结束时才按帧率运行，否则阻塞等待输入
+        active = game_state == GameState.PLAYING or animating
+        events = scheduler.next_frame(active)
 
-        for event in pygame.event.get():
+        profiler.start('events')
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
                 break
@@ -208,184 +351,196 @@ def main():
                 if event.key == pygame.K_q:
                     running = False
                     break
+                elif event.key == pygame.K_F3:
+                    profiler.toggle_overlay()
+                    renderer.invalidate()
                 elif event.key == pygame.K_ESCAPE and game_state == GameState.PLAYING:
                     game_state = GameState.PAUSED
-                    saved_game_state = (board, current_block, next_block)
+                    has_saved_game = pause_game(core)
                 
                 # 游戏进行时的按键控制
                 if game_state == GameState.PLAYING:
-                    if event.key == pygame.K_LEFT:
-                        current_block.x -= 1
-                        if not board.is_valid_move(current_block):
-                            current_block.x += 1
-                    elif event.key == pygame.K_RIGHT:
-                        current_block.x += 1
-                        if not board.is_valid_move(current_block):
-                            current_block.x -= 1
-                    elif event.key == pygame.K_UP:
-                        # 尝试旋转，如果不合法就恢复
-                        current_block.rotate()
-                        if not board.is_valid_move(current_block):
-                            current_block.rotate_back()
-                    elif event.key == pygame.K_DOWN:
-                        fall_speed = 0.1
-                    elif event.key == pygame.K_SPACE:
-                        # 硬降落
-                        while board.is_valid_move(current_block):
-                            current_block.y += 1
-                        current_block.y -= 1
-                        board.lock_block(current_block)
-                        current_block = next_block
-                        next_block = Block()
-                        fall_time = 0
-                        fall_speed = 0.5
+                    if event.key == pygame.K_a:
+                        autoplay = not autoplay and core.width * core.height <= AUTOPLAY_MAX_CELLS
+                        planned_block = None
+                    elif event.key == pygame.K_t:
+                        toggle_training(core)
+                        renderer.invalidate()
+                    elif event.key == pygame.K_z and core.history is not None:
+                        core.history.undo(core)
+                    elif event.key == pygame.K_x and core.history is not None:
+                        core.history.redo(core)
+                    inputs.key_down(event.key, event.time_ms)
+                # 训练模式下游戏结束后可以后退继续
+                elif (game_state == GameState.GAME_OVER and event.key == pygame.K_z
+                        and core.history is not None and core.history.undo(core)):
+                    game_state = GameState.PLAYING
 
             # 处理按键松开事件
             elif event.type == pygame.KEYUP:
                 if game_state == GameState.PLAYING:
-                    if event.key == pygame.K_DOWN:
-                        fall_speed = 0.5
-
-            # 处理按钮事件
-            if game_state == GameState.MENU:
-                # 更新所有按钮的状态
-                for button in [start_button, continue_button, quit_button]:
-                    if button.handle_event(event):
-                        if button == start_button:
-                            game_state = GameState.PLAYING
-                            board = Board(BOARD_WIDTH, BOARD_HEIGHT)
-                            current_block = Block()
-                            next_block = Block()
-                        elif button == continue_button and saved_game_state:
-                            board, current_block, next_block = saved_game_state
-                            game_state = GameState.PAUSED
-                        elif button == quit_button:
-                            running = False
-                            break
-
-            elif game_state == GameState.PAUSED:
-                if resume_button.handle_event(event):
-                    game_state = GameState.PLAYING
-                elif restart_button.handle_event(event):
-                    game_state = GameState.PLAYING
-                    board = Board(BOARD_WIDTH, BOARD_HEIGHT)
-                    current_block = Block()
-                    next_block = Block()
-                elif back_to_menu_button.handle_event(event):
-                    game_state = GameState.MENU
-                    saved_game_state = (board, current_block, next_block)
-            elif game_state == GameState.GAME_OVER:
-                if restart_button.handle_event(event):
-                    game_state = GameState.PLAYING
-                    board = Board(BOARD_WIDTH, BOARD_HEIGHT)
-                    current_block = Block()
-                    next_block = Block()
-                elif back_to_menu_button.handle_event(event):
-                    game_state = GameState.MENU
-                    saved_game_state = None
-            elif game_state == GameState.PLAYING:
-                if pause_button.handle_event(event):
-                    game_state = GameState.PAUSED
-                    saved_game_state = (board, current_block, next_block)
+                    inputs.key_up(event.key, event.time_ms)
+
+            # 处理按钮事件：鼠标事件只做一次命中检测，交给指针下的按钮
+            profiler.start('buttons')
+            clicked = ui.handle_event(game_state, event)
+            if clicked is None:
+                pass
+            elif clicked is start_button:
+                game_state = GameState.PLAYING
+                core = new_game()
+            elif clicked is continue_button:
+                if has_saved_game:
+                    loaded = load_game()
+                    if loaded is not None:
+                        core = loaded
+                        game_state = GameState.PAUSED
+                    else:
+                        has_saved_game = False
+            elif clicked is quit_button:
+                profiler.stop()
+                running = False
+                break
+            elif clicked is resume_button:
+                game_state = GameState.PLAYING
+            elif clicked is restart_button:
+                game_state = GameState.PLAYING
+                core = new_game()
+            elif clicked is back_to_menu_button:
+                if game_state == GameState.PAUSED:
+                    has_saved_game = save_game(core)
+                game_state = GameState.MENU
+            elif clicked is pause_button:
+                game_state = GameState.PAUSED
+                has_saved_game = pause_game(core)
+            profiler.stop()
+        # 同一帧内的鼠标移动合并为一次悬停更新
+        ui.flush(game_state)
+        profiler.stop()
 
         # 更新游戏态
+        profiler.start('update')
         if game_state == GameState.PLAYING:
-            fall_time += dt
-            if fall_time >= fall_speed:
-                current_block.y += 1
-                if not board.is_valid_move(current_block):
-                    current_block.y -= 1
-                    board.lock_block(current_block)
-                    current_block = next_block
-                    next_block = Block()
-                    if not board.is_valid_move(current_block):
-                        game_state = GameState.GAME_OVER
-                fall_time = 0
-                fall_speed = 0.5
+            action = Action.NONE
+            if autoplay:
+                if planned_block is not core.current_block:
+                    planned_block = core.current_block
+                    move = ai.best_move(core.board, core.current_block, core.next_block)
+                    planned_actions = plan_actions(core.current_block, move) if move else []
+                if planned_actions:
+                    action = planned_actions.pop(0)
+            autosave_period = core.elapsed // AUTOSAVE_INTERVAL
+            core.apply(action)
+            # 逻辑步长为整数毫秒，回放按毫秒时间戳即可精确重现；
+            # 每步先执行该步结束前按下的键，同一帧内的多次输入按先后与重力交错执行
+            for step_end in scheduler.logic_step_times():
+                for action in inputs.actions(step_end):
+                    core.apply(action)
+                core.update(scheduler.logic_step)
+            # 不足一个逻辑步的剩余时间内的输入也立即执行，在这一帧就显示出来
+            for action in inputs.actions(scheduler.frame_time):
+                core.apply(action)
+            # 游戏时间每经过 AUTOSAVE_INTERVAL 秒自动存档一次
+            if core.elapsed // AUTOSAVE_INTERVAL != autosave_period and not core.game_over:
+                has_saved_game = save_game(core)
+        else:
+            # 离开游戏画面时丢弃未执行的输入（加速下落已在暂停时松开）
+            inputs.reset()
 
-        # 绘制游戏画
-        screen.fill(BLACK)
+        # 方块落定后可能结束游戏（包括硬降落）
+        if game_state == GameState.PLAYING and core.game_over:
+            game_state = GameState.GAME_OVER
+            save_replay(core)
+            delete_save()
+            has_saved_game = False
+        profiler.stop()
 
+        # 绘制游戏画
         if game_state == GameState.MENU:
-            if saved_game_state:
-                # 有存档时显示三个按钮
-                buttons = [start_button, continue_button, quit_button]
-                # 更新退出按钮位置到第三行
-                quit_button.rect.y = MENU_BUTTON_START_Y + MENU_BUTTON_GAP * 2
-            else:
-                # 无存档时只显示两个按钮
-                buttons = [start_button, quit_button]
-                # 更新退出按钮位置到第二行
-                quit_button.rect.y = MENU_BUTTON_START_Y + MENU_BUTTON_GAP
-            
+            buttons = menu_buttons(start_button, continue_button, quit_button, has_saved_game)
+            ui.register(GameState.MENU, buttons)
+
+            profiler.start('hud')
             draw_menu(screen, buttons)
+            if profiler.overlay_visible:
+                draw_profiler_overlay(screen, profiler)
+            profiler.stop()
+            profiler.start('flip')
+            pygame.display.flip()
+            profiler.stop()
+            visible_buttons = buttons
         else:
-            # 绘制游戏边框
-            pygame.draw.rect(screen, WHITE, 
-                           (BOARD_OFFSET_X - 2, BOARD_OFFSET_Y - 2,
-                            BOARD_WIDTH * BLOCK_SIZE + 4,
-                            BOARD_HEIGHT * BLOCK_SIZE + 4), 2)
-
-            # 绘制游戏板
-            for y in range(board.height):
-                for x in range(board.width):
-                    color = board.board[y][x]
-                    pygame.draw.rect(screen, color,
-                                   (BOARD_OFFSET_X + x * BLOCK_SIZE,
-                                    BOARD_OFFSET_Y + y * BLOCK_SIZE,
-                                    BLOCK_SIZE - 1, BLOCK_SIZE - 1))
-
-            # 绘制当前方块
-            if game_state == GameState.PLAYING:
-                positions = current_block.get_positions()
-                for x, y in positions:
-                    if y >= 0:
-                        pygame.draw.rect(screen, current_block.color,
-                                       (BOARD_OFFSET_X + x * BLOCK_SIZE,
-                                        BOARD_OFFSET_Y + y * BLOCK_SIZE,
-                                        BLOCK_SIZE - 1, BLOCK_SIZE - 1))
-
-            # 绘制分数（移到左上角）
-            score_text = font.render(f'{SCORE_TEXT}: {board.score}', True, WHITE)
-            score_rect = score_text.get_rect(left=20, top=20)
-            screen.blit(score_text, score_rect)
-
-            # 绘制暂停按钮（右上角）
-            pause_button.draw(screen)
-
-            # 绘制下一个块预览（保持在右侧）
-            next_text = font.render(NEXT_BLOCK_TEXT, True, WHITE)
-            screen.blit(next_text, (SCREEN_WIDTH - 150, 80))  # Y坐标改为80
-            
-            preview_offset_x = SCREEN_WIDTH - 120
-            preview_offset_y = 120  # Y坐标改为120
-            for y in range(len(next_block.shape)):
-                for x in range(len(next_block.shape[y])):
-                    if next_block.shape[y][x]:
-                        pygame.draw.rect(screen, next_block.color,
-                                       (preview_offset_x + x * BLOCK_SIZE,
-                                        preview_offset_y + y * BLOCK_SIZE,
-                                        BLOCK_SIZE - 1, BLOCK_SIZE - 1))
-
-            # 绘制游戏结或暂停信息
+            if pause_button is None:
+                pause_button, resume_button, restart_button, back_to_menu_button = \
+                    create_game_buttons(center_x)
+                ui.register(GameState.PLAYING, [pause_button])
+                ui.register(GameState.PAUSED, [resume_button, restart_button, back_to_menu_button])
+                ui.register(GameState.GAME_OVER, [restart_button, back_to_menu_button])
+
+            # 状态切换时覆盖层会出现或消失，需要整屏重绘
+            if game_state != drawn_state:
+                renderer.invalidate()
+
+            # 游戏板、当前方块、分数和预览只重绘变化的部分
+            profiler.start('board')
+            dirty = renderer.draw(core.board, core.current_block, core.next_block,
+                                  game_state == GameState.PLAYING)
+            profiler.stop()
+
+            # 按钮和提示文字绘制在游戏画面之上，先恢复其下方的内容再重绘
+            overlay_buttons = [pause_button]
+            overlay_texts = []
+            if core.history is not None:
+                overlay_texts.append((get_font(24), TRAINING_TEXT, (20, 70)))
             if game_state == GameState.GAME_OVER:
-                game_over_text = font.render(GAME_OVER_TEXT, True, WHITE)
-                screen.blit(game_over_text, 
-                           (SCREEN_WIDTH // 2 - 60, SCREEN_HEIGHT // 2 - 100))
-                restart_button.draw(screen)
-                back_to_menu_button.draw(screen)
+                overlay_texts.append((font, GAME_OVER_TEXT, (SCREEN_WIDTH // 2 - 60, SCREEN_HEIGHT // 2 - 100)))
+                overlay_buttons += [restart_button, back_to_menu_button]
             elif game_state == GameState.PAUSED:
-                pause_text = font.render(PAUSE_BUTTON_TEXT, True, WHITE)
-                screen.blit(pause_text, 
-                           (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 150))
-                resume_button.draw(screen)
-                restart_button.draw(screen)
-                back_to_menu_button.draw(screen)
-
-        pygame.display.flip()
-
+                overlay_texts.append((font, PAUSE_BUTTON_TEXT, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 150)))
+                overlay_buttons += [resume_button, restart_button, back_to_menu_button]
+
+            profiler.start('hud')
+            for text_font, text, pos in overlay_texts:
+                text_surface = surface_cache.render(text_font, text, WHITE)
+                dirty.append(renderer.restore(text_surface.get_rect(topleft=pos)))
+                screen.blit(text_surface, pos)
+            for button in overlay_buttons:
+                # 已经静止且下方没有重绘的按钮保持上一帧的画面
+                bounds = button.bounds
+                if button.settled and bounds.collidelist(dirty) == -1:
+                    continue
+                dirty.append(renderer.restore(bounds))
+                button.draw(screen)
+            if profiler.overlay_visible:
+                dirty.append(draw_profiler_overlay(screen, profiler, renderer))
+            profiler.stop()
+
+            profiler.start('flip')
+            pygame.display.update(dirty)
+            profiler.stop()
+            # 这一帧执行的按键从到达到显示在屏幕上的延迟
+            shown = now_ms()
+            for time_ms in inputs.take_applied():
+                profiler.record_latency(shown - time_ms)
+            visible_buttons = overlay_buttons
+
+        if drawn_state is None:
+            startup.mark('绘制首帧')
+            if STARTUP_REPORT:
+                print(startup.report())
+        drawn_state = game_state
+        animating = any(button.is_animating for button in visible_buttons)
+        profiler.end_frame(active)
+
+    # 退出时保存未结束的游戏，下次启动可以继续
+    if game_state in (GameState.PLAYING, GameState.PAUSED):
+        pause_game(core)
+    if PROFILE_PATH:
+        profiler.export(PROFILE_PATH)
     pygame.quit()
     sys.exit()
 
+startup.mark('导入模块')
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file
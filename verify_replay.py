@@ -0,0 +1,31 @@
+import argparse
+import sys
+import time
+
+from game.replay import Replay
+
+def verify(path, expected_score=None):
+    """重新模拟一个回放文件，输出结果并核对分数"""
+    replay = Replay.load(path)
+    start = time.perf_counter()
+    core = replay.simulate()
+    elapsed = time.perf_counter() - start
+    game_time = replay.events[-1][0] / 1000 if replay.events else 0.0
+    speed = game_time / elapsed if elapsed else float('inf')
+    print(f"{path}: 分数 {core.score}, 消除 {core.lines} 行, {core.pieces} 个方块, "
+          f"游戏时长 {game_time:.1f} 秒, 模拟耗时 {elapsed * 1000:.1f} 毫秒 ({speed:.0f} 倍实时)")
+    if expected_score is not None and core.score != expected_score:
+        print(f"分数不一致: 申报 {expected_score}, 重新模拟得到 {core.score}")
+        return False
+    return True
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='重新模拟回放文件以核对分数')
+    parser.add_argument('paths', nargs='+', help='回放文件 (.trp)')
+    parser.add_argument('--score', type=int, default=None, help='申报的分数，不一致时返回非零退出码')
+    args = parser.parse_args(argv)
+    ok = all([verify(path, args.score) for path in args.paths])
+    return 0 if ok else 1
+
+if __name__ == '__main__':
+    sys.exit(main())